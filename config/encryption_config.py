@@ -31,6 +31,7 @@ ENCRYPTION_CONFIG = {
 async def initialize_enterprise_encryption():
     """Initialize enterprise encryption system"""
     encryption_engine = EnterpriseEncryptionEngine(ENCRYPTION_CONFIG)
+    await encryption_engine.initialize()
     secure_data_manager = SecureDataManager(encryption_engine)
     
     logger.info("🔐 Enterprise Encryption System Ready")
@@ -1,4 +1,6 @@
 # core/enterprise_security.py
+import json
+
 class EnterpriseSecurityManager:
     """
     Unified enterprise security management
@@ -32,8 +34,8 @@ class EnterpriseSecurityManager:
                 raise AccessDeniedError("Insufficient permissions")
             
             # 3. Encrypt sensitive data
-            encrypted_data = await self.encryption_engine.encrypt_data(
-                data, 
+            encrypted_data = await self.encryption_engine.fused_encrypt(
+                json.dumps(data, sort_keys=True, default=str).encode(),
                 self._determine_sensitivity(data)
             )
             
@@ -56,19 +58,34 @@ app = FastAPI()
 security = HTTPBearer()
 enterprise_security = EnterpriseSecurityManager(load_config())
 
+@app.on_event("startup")
+async def start_security_listeners():
+    """Subscribe to authorization cache invalidations from other instances"""
+    await enterprise_security.access_control.initialize_access_controls()
+
 @app.middleware("http")
 async def security_middleware(request: Request, call_next):
     """Enterprise security middleware for all requests"""
-    security_result = await enterprise_security.api_gateway.process_api_request(request)
+    gateway = enterprise_security.api_gateway
+    security_result = await gateway.process_api_request(request)
     
     if not security_result.get('allowed', True):
         raise HTTPException(
-            status_code=429 if security_result.get('reason') == 'rate_limit_exceeded' else 403,
+            status_code=security_result.get(
+                'status_code',
+                429 if security_result.get('reason') == 'rate_limit_exceeded' else 403
+            ),
             detail=security_result.get('reason', 'access_denied')
         )
     
-    response = await call_next(request)
-    return response
+    # The admission slot is held until the backend responds
+    dropped = True
+    try:
+        response = await call_next(request)
+        dropped = response.status_code >= 500
+        return response
+    finally:
+        gateway.complete_api_request(security_result, dropped=dropped)
 
 @app.post("/api/v1/analyze")
 async def analyze_message(
@@ -71,15 +71,17 @@ class SecureEvidenceStore:
         serialized_data = json.dumps(evidence_data).encode()
         
         # Encrypt with enterprise encryption
-        encryption_result = await self.encryption_engine.encrypt_data(
+        encryption_result = await self.encryption_engine.fused_encrypt(
             serialized_data,
-            SensitivityLevel.CRITICAL,
-            [EncryptionLayer.AT_REST, EncryptionLayer.BACKUP]
+            SensitivityLevel.CRITICAL
         )
         
+        # The nonce and data key id are needed to decrypt a fused result
         return {
             'evidence_id': evidence.evidence_id,
             'encrypted_data': encryption_result.encrypted_data,
+            'iv': encryption_result.iv,
+            'key_id': encryption_result.key_id,
             'encryption_metadata': encryption_result.encryption_metadata,
             'storage_timestamp': datetime.utcnow()
         }
@@ -1,25 +1,86 @@
 # core/security/access_control.py
-from enum import Enum
-from typing import Dict, List, Set
+from enum import IntFlag
+from typing import Dict, List, Optional
 import asyncio
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from cachetools import TTLCache
+import redis.asyncio as aioredis
 
-class PermissionLevel(Enum):
-    VIEW = "view"
-    EDIT = "edit" 
-    DELETE = "delete"
-    ADMINISTER = "administer"
-    SUPER_USER = "super_user"
+class PermissionLevel(IntFlag):
+    VIEW = 1
+    EDIT = 2
+    DELETE = 4
+    ADMINISTER = 8
+    SUPER_USER = 16
+    
+    @classmethod
+    def from_legacy(cls, value) -> "PermissionLevel":
+        """Parse the pre-bitmask string form ("view", "super_user", ...) or a list of them"""
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            try:
+                return cls[value.upper()]
+            except KeyError:
+                raise ValueError(f"Unknown permission: {value}") from None
+        if isinstance(value, int):
+            return cls(value)
+        
+        mask = cls(0)
+        for item in value:
+            mask |= cls.from_legacy(item)
+        return mask
+    
+    def to_legacy(self) -> List[str]:
+        """String form of every permission in the mask, for JSON/config output"""
+        return [member.name.lower() for member in PermissionLevel if member & self]
 
 @dataclass
 class Role:
     role_id: str
     name: str
-    permissions: Set[PermissionLevel]
+    permissions_mask: PermissionLevel
     data_scopes: List[str]
     temporal_constraints: Dict
     inheritance: List[str] = None
+    effective_mask: PermissionLevel = PermissionLevel(0)
+    
+    @classmethod
+    def from_dict(cls, record: Dict) -> "Role":
+        """Load a role from JSON/config; 'permissions' may use the legacy string values"""
+        return cls(
+            role_id=record['role_id'],
+            name=record['name'],
+            permissions_mask=PermissionLevel.from_legacy(record.get('permissions', ())),
+            data_scopes=list(record.get('data_scopes', ())),
+            temporal_constraints=dict(record.get('temporal_constraints', {})),
+            inheritance=record.get('inheritance')
+        )
+    
+    def to_dict(self) -> Dict:
+        """JSON/config form of the role, with permissions as legacy strings"""
+        return {
+            'role_id': self.role_id,
+            'name': self.name,
+            'permissions': self.permissions_mask.to_legacy(),
+            'data_scopes': list(self.data_scopes),
+            'temporal_constraints': dict(self.temporal_constraints),
+            'inheritance': self.inheritance
+        }
+
+_SCOPE_TERMINAL = object()
+
+def _build_scope_trie(data_scopes: List[str]) -> Dict:
+    """Build a prefix trie over '/'-separated data scopes"""
+    trie = {}
+    for scope in data_scopes:
+        node = trie
+        for segment in scope.split('/'):
+            node = node.setdefault(segment, {})
+        node[_SCOPE_TERMINAL] = True
+    return trie
 
 class EnterpriseAccessControl:
     """
@@ -29,24 +90,47 @@ class EnterpriseAccessControl:
     def __init__(self, config: Dict):
         self.config = config
         self.role_registry = self._initialize_roles()
+        
+        # Compiled data scopes: one trie per role, "all_data" as a flag
+        self._scope_tries = {
+            role_id: _build_scope_trie(role.data_scopes)
+            for role_id, role in self.role_registry.items()
+        }
+        self._all_data_roles = {
+            role_id for role_id, role in self.role_registry.items()
+            if "all_data" in role.data_scopes
+        }
         self.policy_engine = PolicyDecisionPoint()
         self.session_manager = SecureSessionManager()
         self.mfa_engine = MultiFactorAuthEngine()
         
+        # Two-tier authorization cache: in-process TTL (L1) + shared Redis (L2)
+        cache_config = config.get('access_cache', {})
+        self._auth_cache_ttl = cache_config.get('ttl', 30)
+        self._auth_cache = TTLCache(maxsize=cache_config.get('maxsize', 100_000), ttl=self._auth_cache_ttl)
+        redis_url = config.get('redis', {}).get('url')
+        self._redis = aioredis.from_url(redis_url) if redis_url else None
+        self._invalidation_task = None
+        
+    async def initialize_access_controls(self):
+        """Start listening for cache invalidations published by other instances"""
+        if self._redis is not None and (self._invalidation_task is None or self._invalidation_task.done()):
+            self._invalidation_task = asyncio.create_task(self.listen_for_invalidations())
+        
     def _initialize_roles(self) -> Dict[str, Role]:
         """Initialize enterprise roles with least privilege"""
-        return {
+        roles = {
             "analyst": Role(
                 role_id="analyst",
                 name="Intelligence Analyst",
-                permissions={PermissionLevel.VIEW, PermissionLevel.EDIT},
+                permissions_mask=PermissionLevel.VIEW | PermissionLevel.EDIT,
                 data_scopes=["telegram_data", "analysis_results"],
                 temporal_constraints={"max_session_hours": 8}
             ),
             "supervisor": Role(
                 role_id="supervisor",
                 name="Team Supervisor", 
-                permissions={PermissionLevel.VIEW, PermissionLevel.EDIT, PermissionLevel.DELETE},
+                permissions_mask=PermissionLevel.VIEW | PermissionLevel.EDIT | PermissionLevel.DELETE,
                 data_scopes=["telegram_data", "analysis_results", "user_management"],
                 temporal_constraints={"max_session_hours": 12},
                 inheritance=["analyst"]
@@ -54,7 +138,7 @@ class EnterpriseAccessControl:
             "admin": Role(
                 role_id="admin",
                 name="System Administrator",
-                permissions={PermissionLevel.VIEW, PermissionLevel.EDIT, PermissionLevel.DELETE, PermissionLevel.ADMINISTER},
+                permissions_mask=PermissionLevel.VIEW | PermissionLevel.EDIT | PermissionLevel.DELETE | PermissionLevel.ADMINISTER,
                 data_scopes=["all_data"],
                 temporal_constraints={"max_session_hours": 24},
                 inheritance=["supervisor"]
@@ -62,22 +146,88 @@ class EnterpriseAccessControl:
             "auditor": Role(
                 role_id="auditor",
                 name="Compliance Auditor",
-                permissions={PermissionLevel.VIEW},
+                permissions_mask=PermissionLevel.VIEW,
                 data_scopes=["audit_logs", "compliance_data"],
                 temporal_constraints={"max_session_hours": 4}
             )
         }
+        
+        # Configured roles (legacy string permissions) add to or replace the defaults
+        for record in self.config.get('roles', ()):
+            role = Role.from_dict(record)
+            roles[role.role_id] = role
+        
+        self._compute_effective_masks(roles)
+        return roles
+    
+    @staticmethod
+    def _compute_effective_masks(roles: Dict[str, Role]):
+        """Collapse inheritance into a transitive mask per role"""
+        for role in roles.values():
+            role.effective_mask = PermissionLevel(0)
+        
+        def effective_mask(role: Role) -> PermissionLevel:
+            if not role.effective_mask:
+                mask = role.permissions_mask
+                for inherited in role.inheritance or ():
+                    mask |= effective_mask(roles[inherited])
+                role.effective_mask = mask
+            return role.effective_mask
+        
+        for role in roles.values():
+            effective_mask(role)
+    
+    async def update_role_permissions(self, role_id: str, permissions):
+        """Change a role's permissions (mask or legacy strings); every cached decision may depend on it"""
+        self.role_registry[role_id].permissions_mask = PermissionLevel.from_legacy(permissions)
+        self._compute_effective_masks(self.role_registry)
+        await self.invalidate_all()
+    
+    async def assign_user_roles(self, user_id: str, role_ids: List[str]):
+        """Replace a user's role assignment and drop their cached decisions"""
+        unknown = [role_id for role_id in role_ids if role_id not in self.role_registry]
+        if unknown:
+            raise ValueError(f"Unknown roles: {unknown}")
+        
+        await self._store_user_roles(user_id, role_ids)
+        await self.invalidate(user_id)
+    
+    async def terminate_session(self, session_token: str, user_id: str):
+        """End a session; decisions cached for its token must not outlive it"""
+        await self.session_manager.end_session(session_token)
+        await self.invalidate(user_id)
     
     async def authenticate_user(self, credentials: Dict) -> Dict:
         """Multi-factor authentication with risk assessment"""
+        # Cheapest step first: invalid primary credentials should fail fast
         auth_steps = [
-            self._verify_primary_credentials(credentials),
-            self._check_mfa_requirement(credentials),
-            self._assess_authentication_risk(credentials),
-            self._verify_device_compliance(credentials)
+            self._verify_primary_credentials,
+            self._check_mfa_requirement,
+            self._assess_authentication_risk,
+            self._verify_device_compliance
         ]
+        step_timeout = self.config.get('auth_step_timeout', 5)
+        
+        async def run_step(index: int, step) -> tuple:
+            try:
+                return index, await asyncio.wait_for(step(credentials), step_timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Authentication step {step.__name__} timed out")
+                return index, False
         
-        results = await asyncio.gather(*auth_steps)
+        tasks = [asyncio.create_task(run_step(index, step)) for index, step in enumerate(auth_steps)]
+        results = [None] * len(tasks)
+        
+        # Short-circuit on the first hard failure instead of waiting for every step
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, passed = await next_done
+                results[index] = passed
+                if not passed:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
         
         if all(results):
             session = await self.session_manager.create_secure_session(credentials)
@@ -93,6 +243,21 @@ class EnterpriseAccessControl:
     
     async def authorize_access(self, session_token: str, resource: str, action: PermissionLevel) -> bool:
         """Authorize access using RBAC + ABAC"""
+        # Callers may still pass the legacy string form; anything unknown is denied
+        try:
+            action = PermissionLevel.from_legacy(action)
+        except (ValueError, TypeError):
+            logger.warning(f"Access denied for unknown action {action!r} on {resource}")
+            return False
+        
+        cache_key = hashlib.blake2b(
+            f"{session_token}|{resource}|{action.value}".encode(), digest_size=16
+        ).digest()
+        
+        cached = await self._get_cached_decision(cache_key)
+        if cached is not None:
+            return cached
+        
         # Validate session
         session = await self.session_manager.validate_session(session_token)
         if not session:
@@ -102,7 +267,7 @@ class EnterpriseAccessControl:
         user_roles = await self._get_user_roles(session.user_id)
         
         # Check RBAC permissions
-        rbac_allowed = await self._check_rbac_permissions(user_roles, resource, action)
+        rbac_allowed = self._check_rbac_permissions(user_roles, resource, action)
         
         # Check ABAC policies
         abac_allowed = await self.policy_engine.evaluate_access_policies(
@@ -112,21 +277,158 @@ class EnterpriseAccessControl:
         # Check temporal constraints
         temporal_allowed = await self._check_temporal_constraints(session, user_roles)
         
-        return rbac_allowed and abac_allowed and temporal_allowed
+        allowed = rbac_allowed and abac_allowed and temporal_allowed
+        await self._cache_decision(cache_key, session.user_id, allowed)
+        
+        return allowed
+    
+    async def _get_cached_decision(self, cache_key: bytes) -> Optional[bool]:
+        """Look up an authorization decision in L1, then L2"""
+        entry = self._auth_cache.get(cache_key)
+        if entry is not None:
+            return entry[1]
+        
+        if self._redis is None:
+            return None
+        
+        try:
+            value = await self._redis.get(b"rbac:auth:" + cache_key.hex().encode())
+        except Exception as e:
+            logger.warning(f"Authorization cache (L2) unavailable: {e}")
+            return None
+        
+        if value is None:
+            return None
+        
+        user_id, _, allowed = value.decode().rpartition("|")
+        decision = allowed == "1"
+        self._auth_cache[cache_key] = (user_id, decision)
+        return decision
     
-    async def _check_rbac_permissions(self, roles: List[Role], resource: str, action: PermissionLevel) -> bool:
+    async def _cache_decision(self, cache_key: bytes, user_id: str, allowed: bool):
+        """Store an authorization decision in L1 and L2"""
+        self._auth_cache[cache_key] = (user_id, allowed)
+        
+        if self._redis is None:
+            return
+        
+        redis_key = b"rbac:auth:" + cache_key.hex().encode()
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.setex(redis_key, self._auth_cache_ttl, f"{user_id}|{int(allowed)}")
+                pipe.sadd(f"rbac:user:{user_id}", redis_key)
+                pipe.expire(f"rbac:user:{user_id}", self._auth_cache_ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Authorization cache (L2) write failed: {e}")
+    
+    async def invalidate(self, user_id: str):
+        """Invalidate cached authorization decisions for a user (e.g. on role change)"""
+        self._drop_cached_user(user_id)
+        
+        if self._redis is None:
+            return
+        
+        # L2 entries expire on their own TTL, so a Redis outage must not fail the mutation
+        user_key = f"rbac:user:{user_id}"
+        try:
+            redis_keys = await self._redis.smembers(user_key)
+            if redis_keys:
+                await self._redis.delete(*redis_keys)
+            await self._redis.delete(user_key)
+            await self._redis.publish("rbac:invalidate", user_id)
+        except Exception as e:
+            logger.warning(f"Authorization cache (L2) invalidation failed for {user_id}: {e}")
+    
+    async def invalidate_all(self):
+        """Invalidate every cached authorization decision (e.g. on role permission change)"""
+        self._auth_cache.clear()
+        
+        if self._redis is None:
+            return
+        
+        try:
+            stale_keys = [key async for key in self._redis.scan_iter(match="rbac:*")]
+            if stale_keys:
+                await self._redis.delete(*stale_keys)
+            await self._redis.publish("rbac:invalidate", "*")
+        except Exception as e:
+            logger.warning(f"Authorization cache (L2) invalidation failed: {e}")
+    
+    async def listen_for_invalidations(self):
+        """Wipe L1 entries when another instance publishes a role change"""
+        if self._redis is None:
+            return
+        
+        while True:
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe("rbac:invalidate")
+                async for message in pubsub.listen():
+                    if message['type'] != 'message':
+                        continue
+                    user_id = message['data'].decode()
+                    if user_id == "*":
+                        self._auth_cache.clear()
+                    else:
+                        self._drop_cached_user(user_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Missed messages are covered by the L1 TTL; start clean and resubscribe
+                logger.warning(f"Authorization invalidation listener error: {e}")
+                self._auth_cache.clear()
+                await asyncio.sleep(1)
+    
+    def _drop_cached_user(self, user_id: str):
+        """Remove all L1 entries belonging to a user"""
+        stale_keys = [key for key, (owner, _) in self._auth_cache.items() if owner == user_id]
+        for key in stale_keys:
+            self._auth_cache.pop(key, None)
+    
+    def _check_rbac_permissions(self, roles: List[Role], resource: str, action: PermissionLevel) -> bool:
         """Check Role-Based Access Control permissions"""
-        for role in roles:
-            # Check direct permissions
-            if action in role.permissions:
-                # Check data scope
-                if self._is_resource_in_scope(resource, role.data_scopes):
-                    return True
+        # Iterative walk of the inheritance graph; each role is visited once
+        stack = list(roles)
+        visited = set()
+        
+        while stack:
+            role = stack.pop()
+            if role.role_id in visited:
+                continue
+            visited.add(role.role_id)
+            
+            # Nothing in this role's inheritance closure grants the action
+            if not role.effective_mask & action:
+                continue
             
-            # Check inherited roles
+            # Check direct permissions and data scope
+            if role.permissions_mask & action and self._is_resource_in_scope(resource, role.role_id):
+                return True
+            
+            # Queue inherited roles
             if role.inheritance:
-                inherited_roles = [self.role_registry[inherited] for inherited in role.inheritance]
-                if await self._check_rbac_permissions(inherited_roles, resource, action):
-                    return True
+                stack.extend(
+                    self.role_registry[inherited] for inherited in role.inheritance
+                    if inherited not in visited
+                )
+        
+        return False
+    
+    def _is_resource_in_scope(self, resource: str, role_id: str) -> bool:
+        """Check whether a resource falls under one of the role's data scopes"""
+        if role_id in self._all_data_roles:
+            return True
+        
+        node = self._scope_tries.get(role_id)
+        if not node:
+            return False
+        
+        for segment in resource.split('/'):
+            node = node.get(segment)
+            if node is None:
+                return False
+            if _SCOPE_TERMINAL in node:
+                return True
         
         return False
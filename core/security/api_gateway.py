@@ -4,6 +4,7 @@ import asyncio
 import time
 from dataclasses import dataclass
 from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 @dataclass
@@ -27,34 +28,98 @@ class EnterpriseAPISecurityGateway:
         self.request_validator = APIRequestValidator(config)
         self.auth_provider = APIAuthProvider(config)
         
-        # Security middleware chain
-        self.middleware_chain = [
-            self._validate_authentication,
+        # Security middleware stages: authentication gates everything, the
+        # independent checks run concurrently (list order is denial priority),
+        # and policy enforcement runs last
+        self._auth_stage = [self._validate_authentication]
+        self._parallel_stage = [
             self._check_rate_limits,
             self._detect_threats,
-            self._validate_request,
-            self._enforce_policies
+            self._validate_request
         ]
+        self._final_stage = [self._enforce_policies]
     
     async def process_api_request(self, request: Request) -> Dict:
         """Process API request through security gateway"""
         security_context = await self._create_security_context(request)
         
-        # Execute security middleware chain
-        for middleware in self.middleware_chain:
-            result = await middleware(request, security_context)
-            if not result.get('allowed', True):
+        # Adaptive concurrency admission
+        admission_ticket = self.rate_limiter.concurrency_limiter.try_acquire()
+        if admission_ticket is None:
+            result = {"allowed": False, "reason": "concurrency_limit_exceeded", "status_code": 503}
+            await self._handle_blocked_request(request, security_context, result)
+            return result
+        
+        # Until an allowed result carrying the ticket is returned, every exit
+        # (denial, error, cancellation) must give the slot back
+        handed_off = False
+        try:
+            # Execute security middleware stages
+            result = await self._run_sequential_stage(self._auth_stage, request, security_context)
+            if result is None:
+                result = await self._run_parallel_stage(request, security_context)
+            if result is None:
+                result = await self._run_sequential_stage(self._final_stage, request, security_context)
+            
+            if result is not None:
+                self.rate_limiter.concurrency_limiter.release(admission_ticket, dropped=True)
+                handed_off = True
                 await self._handle_blocked_request(request, security_context, result)
                 return result
+            
+            # Request passed all security checks
+            await self._log_approved_request(request, security_context)
+            
+            approved = {
+                "allowed": True,
+                "security_context": security_context,
+                "processing_tier": await self._determine_processing_tier(security_context),
+                "admission_ticket": admission_ticket
+            }
+            handed_off = True
+            return approved
+        finally:
+            if not handed_off:
+                self.rate_limiter.concurrency_limiter.release(admission_ticket, dropped=True)
+    
+    def complete_api_request(self, gateway_result: Dict, dropped: bool = False):
+        """
+        Release an admitted request once the backend has responded
+        Must be called exactly once for every allowed result; dropped requests
+        (backend failure) release the slot without feeding the latency estimate
+        """
+        admission_ticket = gateway_result.pop("admission_ticket", None)
+        if admission_ticket is not None:
+            self.rate_limiter.concurrency_limiter.release(admission_ticket, dropped=dropped)
+    
+    async def _run_sequential_stage(self, stage: List, request: Request, 
+                                    context: APISecurityContext) -> Optional[Dict]:
+        """Run middleware in order, returning the first denial"""
+        for middleware in stage:
+            result = await middleware(request, context)
+            if not result.get('allowed', True):
+                return result
+        return None
+    
+    async def _run_parallel_stage(self, request: Request, context: APISecurityContext) -> Optional[Dict]:
+        """Run independent middleware concurrently, cancelling siblings on the first denial"""
+        tasks = [asyncio.create_task(middleware(request, context)) for middleware in self._parallel_stage]
+        pending = set(tasks)
         
-        # Request passed all security checks
-        await self._log_approved_request(request, security_context)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(not task.result().get('allowed', True) for task in done):
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
         
-        return {
-            "allowed": True,
-            "security_context": security_context,
-            "processing_tier": await self._determine_processing_tier(security_context)
-        }
+        # Among completed checks, the earliest in stage order wins
+        for task in tasks:
+            if task.done() and not task.cancelled() and not task.result().get('allowed', True):
+                return task.result()
+        return None
     
     async def _validate_authentication(self, request: Request, context: APISecurityContext) -> Dict:
         """Validate API authentication and authorization"""
@@ -62,7 +127,12 @@ class EnterpriseAPISecurityGateway:
             # Extract credentials
             credentials = await self._extract_credentials(request)
             
-            # Authenticate
+            # JWT decode/signature verification is CPU-bound: only that step
+            # leaves the event loop; the provider's async I/O stays on it
+            verify = getattr(self.auth_provider, 'verify_credentials', None)
+            if verify is not None:
+                credentials = await run_in_threadpool(verify, credentials)
+            
             auth_result = await self.auth_provider.authenticate(credentials)
             if not auth_result.authenticated:
                 return {"allowed": False, "reason": "authentication_failed"}
@@ -1,12 +1,134 @@
 # core/security/api_threat_detection.py
+import asyncio
+import numpy as np
+
+try:
+    import re2 as re  # Linear-time DFA matching, immune to ReDoS
+except ImportError:
+    import re
+
+INJECTION_PATTERNS = [
+    (r'(\%27)|(\')|(\-\-)|(\%23)|(#)', 'sql_injection'),
+    (r'(\|\||\/\*|\*\/|;|\-\-)', 'sql_injection_advanced'),
+    (r'(union.*select)', 'union_sql_injection'),
+    (r'(\;|\|\||\&\&|\`|\$\(|\$\{)', 'command_injection'),
+    (r'(\.\.\/|\.\.\\|\\\.\.|\/\.\.)', 'path_traversal')
+]
+
+class BehavioralBatcher:
+    """
+    Micro-batch behavioral feature vectors so the anomaly model scores
+    many requests in one vectorized pass instead of one call per request
+    
+    Analyzers without detect_anomalies_batch, and feature dicts that are not
+    all numeric, are scored one at a time through detect_anomalies
+    """
+    
+    FEATURE_NAMES = (
+        "request_frequency",
+        "endpoint_access_pattern",
+        "parameter_usage",
+        "temporal_pattern",
+        "geographic_consistency"
+    )
+    
+    def __init__(self, analyzer, max_batch: int = 64, max_delay_ms: float = 5):
+        self.analyzer = analyzer
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue = asyncio.Queue()
+        self._worker = None
+        self._batch_scorer = getattr(analyzer, 'detect_anomalies_batch', None)
+    
+    async def score(self, features: Dict) -> float:
+        """Queue a feature dict and wait for its batched anomaly score"""
+        vector = self._to_vector(features) if self._batch_scorer is not None else None
+        if vector is None:
+            return float(await self.analyzer.detect_anomalies(features))
+        
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((features, vector, future))
+        return await future
+    
+    def _to_vector(self, features: Dict) -> Optional[np.ndarray]:
+        """Feature dict as a float32 row, or None when a feature is missing or not numeric"""
+        try:
+            values = [features[name] for name in self.FEATURE_NAMES]
+        except KeyError:
+            return None
+        
+        if not all(isinstance(value, (int, float, np.number)) for value in values):
+            return None
+        return np.asarray(values, dtype=np.float32)
+    
+    async def _run(self):
+        """Collect up to max_batch requests or wait max_delay, then score them together"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            features = np.stack([vector for _, vector, _ in batch])
+            try:
+                scores = await self._batch_scorer(features)
+            except Exception as e:
+                logger.error(f"Batched behavioral scoring failed: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            if len(scores) != len(batch):
+                # Rows cannot be matched to requests; score each one on its own
+                logger.error(f"Batched behavioral scoring returned {len(scores)} scores for {len(batch)} requests")
+                await self._score_individually(batch)
+                continue
+            
+            for (_, _, future), score in zip(batch, scores):
+                if not future.done():
+                    future.set_result(float(score))
+    
+    async def _score_individually(self, batch: List):
+        """Resolve every future in the batch through per-item detect_anomalies"""
+        for features, _, future in batch:
+            if future.done():
+                continue
+            try:
+                future.set_result(float(await self.analyzer.detect_anomalies(features)))
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+
 class APIThreatDetector:
     """Advanced API threat detection with machine learning"""
     
+    # All injection signatures in one alternation: a single scan rejects clean requests
+    _injection_union = re.compile(
+        "(?i)" + "|".join(f"(?P<g{i}>{pattern})" for i, (pattern, _) in enumerate(INJECTION_PATTERNS))
+    )
+    _injection_compiled = [
+        (pattern, re.compile("(?i)" + pattern), attack_type)
+        for pattern, attack_type in INJECTION_PATTERNS
+    ]
+    
     def __init__(self, config: Dict):
         self.config = config
         self.threat_models = self._load_threat_models()
         self.attack_patterns = self._load_attack_patterns()
         self.behavioral_analyzer = BehavioralThreatAnalyzer()
+        self.behavioral_batcher = BehavioralBatcher(self.behavioral_analyzer)
         
     async def analyze_request(self, request: Request, context: APISecurityContext) -> Dict:
         """Comprehensive API threat analysis"""
@@ -31,19 +153,15 @@ class APIThreatDetector:
     
     async def _detect_injection_attempts(self, request: Request) -> List[Dict]:
         """Detect SQL injection, command injection, etc."""
-        injection_patterns = [
-            (r'(\%27)|(\')|(\-\-)|(\%23)|(#)', 'sql_injection'),
-            (r'(\|\||\/\*|\*\/|;|\-\-)', 'sql_injection_advanced'),
-            (r'(union.*select)', 'union_sql_injection'),
-            (r'(\;|\|\||\&\&|\`|\$\(|\$\{)', 'command_injection'),
-            (r'(\.\.\/|\.\.\\|\\\.\.|\/\.\.)', 'path_traversal')
-        ]
-        
         detected_attempts = []
         request_data = await self._extract_request_data(request)
         
-        for pattern, attack_type in injection_patterns:
-            if re.search(pattern, request_data, re.IGNORECASE):
+        if not self._injection_union.search(request_data):
+            return detected_attempts
+        
+        # Signatures overlap (e.g. ';'), so resolve each type individually on a hit
+        for pattern, compiled, attack_type in self._injection_compiled:
+            if compiled.search(request_data):
                 detected_attempts.append({
                     "type": attack_type,
                     "pattern": pattern,
@@ -62,8 +180,8 @@ class APIThreatDetector:
             "geographic_consistency": await self._check_geographic_consistency(request, context)
         }
         
-        # Use ML model to detect anomalies
-        anomaly_score = await self.behavioral_analyzer.detect_anomalies(behavioral_features)
+        # Use ML model to detect anomalies (scored in micro-batches)
+        anomaly_score = await self.behavioral_batcher.score(behavioral_features)
         
         if anomaly_score > 0.7:
             return [{
@@ -8,9 +8,11 @@ from typing import Dict, Any, Optional, Tuple
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.backends import default_backend
 import asyncio
+import warnings
 from dataclasses import dataclass
 from enum import Enum
 
@@ -40,6 +42,11 @@ class EnterpriseEncryptionEngine:
     Implements NIST-approved cryptographic standards
     """
     
+    # Every fused data key is wrapped by the key manager's master key; there is
+    # no separate KMS/HSM path, so there is a single profile. Sensitivity is
+    # still bound to the ciphertext through the AAD.
+    FUSED_PROFILE = "gcm-master-wrapped"
+    
     def __init__(self, config: Dict):
         self.config = config
         self.backend = default_backend()
@@ -56,13 +63,25 @@ class EnterpriseEncryptionEngine:
         
         logger.info("🔐 Enterprise Encryption Engine initialized")
     
+    async def initialize(self):
+        """Bring up async resources (key database) before first use"""
+        await self.key_manager.initialize()
+    
     async def encrypt_data(self, 
                          plaintext: bytes, 
                          sensitivity: SensitivityLevel,
                          layers: List[EncryptionLayer] = None) -> EncryptionResult:
         """
         Encrypt data with appropriate layers based on sensitivity
+        
+        Deprecated: every layer is a full pass over a copied buffer.
+        Use fused_encrypt() for new data.
         """
+        warnings.warn(
+            "encrypt_data() is deprecated, use fused_encrypt()",
+            DeprecationWarning,
+            stacklevel=2
+        )
         if layers is None:
             layers = self._get_layers_for_sensitivity(sensitivity)
         
@@ -77,7 +96,9 @@ class EnterpriseEncryptionEngine:
                 encryption_chain.append({
                     'layer': layer.value,
                     'algorithm': result.encryption_metadata['algorithm'],
-                    'key_id': result.key_id
+                    'key_id': result.key_id,
+                    'iv': result.iv,
+                    'tag': result.tag
                 })
                 current_data = result.encrypted_data
                 
@@ -103,12 +124,64 @@ class EnterpriseEncryptionEngine:
         
         return final_result
     
+    async def fused_encrypt(self, plaintext: bytes, sensitivity: SensitivityLevel) -> EncryptionResult:
+        """
+        Encrypt data with a single AES-GCM pass under a fresh data key
+        wrapped by the master key
+        """
+        profile = self.FUSED_PROFILE
+        
+        key_record = await self.key_manager.generate_data_key("AES-256", {
+            'purpose': 'fused_encryption',
+            'sensitivity': sensitivity.value,
+            'profile': profile
+        })
+        key_material = await self.key_manager.get_key(key_record['key_id'])
+        
+        nonce = os.urandom(12)
+        aad = f"{profile}|{sensitivity.value}".encode()
+        
+        # AESGCM appends the 16-byte tag; keep it in place to avoid a slice copy
+        sealed = AESGCM(key_material).encrypt(nonce, plaintext, aad)
+        
+        await self.performance_monitor.record_encryption_operation(
+            len(plaintext), sensitivity, []
+        )
+        
+        return EncryptionResult(
+            encrypted_data=sealed,
+            iv=nonce,
+            key_id=key_record['key_id'],
+            encryption_metadata={
+                'sensitivity': sensitivity.value,
+                'profile': profile,
+                'algorithm': 'AES-256-GCM',
+                'tag_appended': True,
+                'timestamp': self._get_current_timestamp()
+            }
+        )
+    
+    async def fused_decrypt(self, encrypted_result: EncryptionResult) -> bytes:
+        """Decrypt data produced by fused_encrypt()"""
+        metadata = encrypted_result.encryption_metadata
+        key_material = await self.key_manager.get_key(encrypted_result.key_id)
+        aad = f"{metadata['profile']}|{metadata['sensitivity']}".encode()
+        
+        try:
+            return AESGCM(key_material).decrypt(encrypted_result.iv, encrypted_result.encrypted_data, aad)
+        except Exception as e:
+            logger.error(f"Decryption failed for profile {metadata['profile']}: {e}")
+            raise DecryptionError(f"Profile {metadata['profile']} decryption failed") from e
+    
     async def decrypt_data(self, 
                          encrypted_result: EncryptionResult,
                          key_material: Dict = None) -> bytes:
         """
         Decrypt data through the encryption layers
         """
+        if 'profile' in encrypted_result.encryption_metadata:
+            return await self.fused_decrypt(encrypted_result)
+        
         layers_applied = encrypted_result.encryption_metadata['layers_applied']
         current_data = encrypted_result.encrypted_data
         
@@ -119,8 +192,8 @@ class EnterpriseEncryptionEngine:
                 decryptor = self.encryption_schemes[layer]
                 current_data = await decryptor.decrypt(
                     current_data, 
-                    encrypted_result.iv,
-                    encrypted_result.tag,
+                    layer_info.get('iv', encrypted_result.iv),
+                    layer_info.get('tag', encrypted_result.tag),
                     key_material
                 )
                 
@@ -1,4 +1,17 @@
 # core/security/encryption_monitor.py
+from collections import deque
+
+_LAYER_BITS = {layer: 1 << index for index, layer in enumerate(EncryptionLayer)}
+
+@dataclass(slots=True)
+class OpRecord:
+    timestamp: float
+    operation: str
+    data_size: int
+    sensitivity: str
+    layers_mask: int
+    performance: Dict
+
 class EncryptionPerformanceMonitor:
     """
     Monitor encryption operations for performance and security
@@ -14,28 +27,29 @@ class EncryptionPerformanceMonitor:
             'average_encryption_time': 0,
             'average_decryption_time': 0
         }
-        self.operation_log = []
+        self.operation_log = deque(maxlen=10000)
     
     async def record_encryption_operation(self, data_size: int, 
                                         sensitivity: SensitivityLevel,
                                         layers: List[EncryptionLayer]):
         """Record encryption operation metrics"""
-        operation = {
-            'timestamp': time.time(),
-            'operation': 'encrypt',
-            'data_size': data_size,
-            'sensitivity': sensitivity.value,
-            'layers': [layer.value for layer in layers],
-            'performance': self._measure_performance()
-        }
+        layers_mask = 0
+        for layer in layers:
+            layers_mask |= _LAYER_BITS[layer]
+        
+        operation = OpRecord(
+            timestamp=time.time(),
+            operation='encrypt',
+            data_size=data_size,
+            sensitivity=sensitivity.value,
+            layers_mask=layers_mask,
+            performance=self._measure_performance()
+        )
         
+        # Bounded log: oldest entries are dropped in O(1)
         self.operation_log.append(operation)
         self.metrics['encryption_operations'] += 1
         self.metrics['total_data_encrypted'] += data_size
-        
-        # Keep log manageable
-        if len(self.operation_log) > 10000:
-            self.operation_log = self.operation_log[-5000:]
     
     async def generate_security_report(self) -> Dict:
         """Generate encryption security audit report"""
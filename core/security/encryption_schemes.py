@@ -1,4 +1,45 @@
 # core/security/encryption_schemes.py
+import ctypes
+import heapq
+import itertools
+import os
+import struct
+from cryptography.hazmat.primitives.kdf.hkdf import HKDFExpand
+
+class IVGenerator:
+    """
+    Cheap IV/nonce source for the encryption schemes
+    
+    Deterministic nonces follow NIST SP 800-38D 8.2.1 (fixed field + invocation
+    counter). They are only unique per key while a key sees fewer than 2**64
+    invocations, so they must not be used with long-lived keys without rotation.
+    Random IVs are sliced from a pooled os.urandom buffer instead of one syscall each.
+    """
+    
+    def __init__(self, pool_ivs: int = 256):
+        self._fixed_field = secrets.randbits(32)
+        self._counter = itertools.count(secrets.randbits(63))
+        self._pool_ivs = pool_ivs
+        self._pool = b""
+        self._pool_offset = 0
+    
+    def gcm_nonce(self) -> bytes:
+        """96-bit deterministic GCM nonce"""
+        return struct.pack(">IQ", self._fixed_field, next(self._counter) & 0xFFFFFFFFFFFFFFFF)
+    
+    def ctr_nonce(self) -> bytes:
+        """128-bit CTR initial block: deterministic nonce + zeroed block counter"""
+        return self.gcm_nonce() + b"\x00\x00\x00\x00"
+    
+    def random_iv(self, size: int = 16) -> bytes:
+        """Unpredictable IV (required for CBC) from the pooled CSPRNG buffer"""
+        if self._pool_offset + size > len(self._pool):
+            self._pool = os.urandom(size * self._pool_ivs)
+            self._pool_offset = 0
+        iv = self._pool[self._pool_offset:self._pool_offset + size]
+        self._pool_offset += size
+        return iv
+
 class TransitEncryptionScheme:
     """
     Encryption for data in transit (network communications)
@@ -8,6 +49,14 @@ class TransitEncryptionScheme:
     def __init__(self, key_manager: KeyManagementSystem):
         self.key_manager = key_manager
         self.algorithm = "AES-256-GCM"
+        self._iv_source = IVGenerator()
+        
+        # Precomputed AAD prefixes, plus the full AAD cached per (sensitivity, second)
+        self._aad_templates = {
+            level: b"purpose=telegram_osint_transit;sensitivity=" + level.value.encode() + b";ts="
+            for level in SensitivityLevel
+        }
+        self._aad_cache = {}
     
     async def encrypt(self, plaintext: bytes, sensitivity: SensitivityLevel) -> EncryptionResult:
         """Encrypt data for transit"""
@@ -18,7 +67,7 @@ class TransitEncryptionScheme:
         })
         
         key_material = await self.key_manager.get_key(key_record['key_id'])
-        iv = secrets.token_bytes(16)  # 128-bit IV
+        iv = self._iv_source.gcm_nonce()  # 96-bit deterministic nonce, fresh key per operation
         
         # AES-GCM encryption
         cipher = Cipher(algorithms.AES(key_material), modes.GCM(iv), backend=default_backend())
@@ -60,12 +109,14 @@ class TransitEncryptionScheme:
     
     def _generate_aad(self, sensitivity: SensitivityLevel) -> bytes:
         """Generate Additional Authenticated Data"""
-        aad_data = {
-            'sensitivity': sensitivity.value,
-            'timestamp': int(time.time()),
-            'purpose': 'telegram_osint_transit'
-        }
-        return json.dumps(aad_data, sort_keys=True).encode()
+        now = int(time.time())
+        cached = self._aad_cache.get(sensitivity)
+        if cached is not None and cached[0] == now:
+            return cached[1]
+        
+        aad = self._aad_templates[sensitivity] + str(now).encode()
+        self._aad_cache[sensitivity] = (now, aad)
+        return aad
 
 class AtRestEncryptionScheme:
     """
@@ -76,6 +127,7 @@ class AtRestEncryptionScheme:
     def __init__(self, key_manager: KeyManagementSystem):
         self.key_manager = key_manager
         self.algorithm = "AES-256-CBC-HMAC-SHA256"
+        self._iv_source = IVGenerator()
     
     async def encrypt(self, plaintext: bytes, sensitivity: SensitivityLevel) -> EncryptionResult:
         """Encrypt data for storage"""
@@ -85,24 +137,26 @@ class AtRestEncryptionScheme:
         })
         
         key_material = await self.key_manager.get_key(key_record['key_id'])
-        iv = secrets.token_bytes(16)
+        iv = self._iv_source.random_iv(16)
         
         # Pad data to block size
         padder = padding.PKCS7(128).padder()
         padded_data = padder.update(plaintext) + padder.finalize()
         
-        # AES-CBC encryption
+        # AES-CBC encryption (input is block-aligned, so finalize() emits nothing)
         cipher = Cipher(algorithms.AES(key_material), modes.CBC(iv), backend=default_backend())
         encryptor = cipher.encryptor()
-        ciphertext = encryptor.update(padded_data) + encryptor.finalize()
+        ciphertext = encryptor.update(padded_data)
+        encryptor.finalize()
         
-        # Generate HMAC for integrity
-        hmac_key = hashlib.sha256(key_material + iv).digest()
-        hmac_value = hmac.new(hmac_key, ciphertext, hashlib.sha256).digest()
+        # Generate HMAC for integrity (one-shot C fast path, no HMAC object)
+        hmac_value = hmac.digest(self._derive_hmac_key(key_material), ciphertext, 'sha256')
         
+        # HMAC travels in the tag field rather than being appended to the ciphertext
         return EncryptionResult(
-            encrypted_data=ciphertext + hmac_value,
+            encrypted_data=ciphertext,
             iv=iv,
+            tag=hmac_value,
             key_id=key_record['key_id'],
             encryption_metadata={
                 'algorithm': self.algorithm,
@@ -111,6 +165,37 @@ class AtRestEncryptionScheme:
                 'integrity_check': 'HMAC-SHA256'
             }
         )
+    
+    async def decrypt(self, ciphertext: bytes, iv: bytes, tag: bytes, 
+                     key_material: Dict = None) -> bytes:
+        """Verify and decrypt data from storage"""
+        if not key_material:
+            raise ValueError("Key material required for decryption")
+        
+        key = await self.key_manager.get_key(key_material['key_id'])
+        
+        expected_tag = hmac.digest(self._derive_hmac_key(key), ciphertext, 'sha256')
+        if not tag or not hmac.compare_digest(expected_tag, tag):
+            raise ValueError("HMAC verification failed")
+        
+        cipher = Cipher(algorithms.AES(key), modes.CBC(iv), backend=default_backend())
+        decryptor = cipher.decryptor()
+        padded_data = decryptor.update(ciphertext) + decryptor.finalize()
+        
+        unpadder = padding.PKCS7(128).unpadder()
+        return unpadder.update(padded_data) + unpadder.finalize()
+    
+    def _derive_hmac_key(self, key_material: bytes) -> bytes:
+        """HKDF-Expand the data key into a dedicated HMAC key"""
+        return HKDFExpand(
+            algorithm=hashes.SHA256(),
+            length=32,
+            info=b'telegram_osint_at_rest_hmac',
+            backend=default_backend()
+        ).derive(key_material)
+
+MAX_LIVE_EPHEMERAL_KEYS = 4096
+EPHEMERAL_KEY_SIZE = 32
 
 class MemoryEncryptionScheme:
     """
@@ -122,30 +207,31 @@ class MemoryEncryptionScheme:
         self.key_manager = key_manager
         self.algorithm = "AES-256-CTR"
         self.ephemeral_keys = {}
+        self.ephemeral_key_ttl = 300
+        self._iv_source = IVGenerator()
+        
+        # Monotonic key IDs and a single expiry heap drained by one reaper task
+        self._key_counter = itertools.count()
+        self._expiry_queue = []
+        self._reaper_task = None
+        
+        # Contiguous key arena with a slot freelist; keys are views into it
+        self._key_arena = bytearray(EPHEMERAL_KEY_SIZE * MAX_LIVE_EPHEMERAL_KEYS)
+        self._arena_view = memoryview(self._key_arena)
+        self._freelist = list(range(MAX_LIVE_EPHEMERAL_KEYS))
     
     async def encrypt(self, plaintext: bytes, sensitivity: SensitivityLevel) -> EncryptionResult:
         """Encrypt data in memory with ephemeral keys"""
         # Use ephemeral keys for memory protection
-        key_id = f"memory_{int(time.time() * 1000)}"
-        key_material = secrets.token_bytes(32)
-        
-        # Store ephemeral key (short-lived)
-        self.ephemeral_keys[key_id] = {
-            'key': key_material,
-            'created_at': time.time(),
-            'sensitivity': sensitivity
-        }
+        key_id, key_material = self._register_ephemeral_key(sensitivity)
         
-        iv = secrets.token_bytes(16)
+        iv = self._iv_source.ctr_nonce()
         
         # AES-CTR for efficient memory encryption
         cipher = Cipher(algorithms.AES(key_material), modes.CTR(iv), backend=default_backend())
         encryptor = cipher.encryptor()
         ciphertext = encryptor.update(plaintext) + encryptor.finalize()
         
-        # Schedule key cleanup
-        asyncio.create_task(self._cleanup_ephemeral_key(key_id))
-        
         return EncryptionResult(
             encrypted_data=ciphertext,
             iv=iv,
@@ -158,10 +244,84 @@ class MemoryEncryptionScheme:
             }
         )
     
-    async def _cleanup_ephemeral_key(self, key_id: str, ttl: int = 300):
+    async def encrypt_batch(self, items: List[bytes], sensitivity: SensitivityLevel) -> List[EncryptionResult]:
+        """Encrypt many small payloads with one ephemeral key and one CTR keystream"""
+        key_id, key_material = self._register_ephemeral_key(sensitivity)
+        
+        iv = self._iv_source.ctr_nonce()
+        
+        # Single cipher setup amortized across the whole batch
+        cipher = Cipher(algorithms.AES(key_material), modes.CTR(iv), backend=default_backend())
+        encryptor = cipher.encryptor()
+        ciphertext = memoryview(encryptor.update(b"".join(items)) + encryptor.finalize())
+        
+        results = []
+        offset = 0
+        for item in items:
+            length = len(item)
+            results.append(EncryptionResult(
+                encrypted_data=bytes(ciphertext[offset:offset + length]),
+                iv=iv,
+                key_id=key_id,
+                encryption_metadata={
+                    'algorithm': self.algorithm,
+                    'ephemeral': True,
+                    'key_size': 256,
+                    'mode': 'CTR',
+                    'offset': offset,
+                    'length': length
+                }
+            ))
+            offset += length
+        
+        return results
+    
+    def _register_ephemeral_key(self, sensitivity: SensitivityLevel) -> Tuple[str, memoryview]:
+        """Create a short-lived key and schedule its expiry"""
+        key_id = f"memory_{next(self._key_counter)}"
+        
+        if self._freelist:
+            slot = self._freelist.pop()
+            start = slot * EPHEMERAL_KEY_SIZE
+            key_material = self._arena_view[start:start + EPHEMERAL_KEY_SIZE]
+            key_material[:] = secrets.token_bytes(EPHEMERAL_KEY_SIZE)
+        else:
+            # Arena exhausted: fall back to a standalone (still wipeable) buffer
+            slot = None
+            key_material = memoryview(bytearray(secrets.token_bytes(EPHEMERAL_KEY_SIZE)))
+        
+        self.ephemeral_keys[key_id] = {
+            'key': key_material,
+            'slot': slot,
+            'created_at': time.time(),
+            'sensitivity': sensitivity
+        }
+        
+        heapq.heappush(self._expiry_queue, (time.monotonic() + self.ephemeral_key_ttl, key_id))
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reap_ephemeral_keys())
+        
+        return key_id, key_material
+    
+    async def _reap_ephemeral_keys(self):
         """Clean up ephemeral keys after TTL"""
-        await asyncio.sleep(ttl)
-        if key_id in self.ephemeral_keys:
-            # Securely wipe from memory
-            self.ephemeral_keys[key_id]['key'] = b'\x00' * 32
-            del self.ephemeral_keys[key_id]
+        while self._expiry_queue:
+            expires_at, key_id = self._expiry_queue[0]
+            delay = expires_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            
+            heapq.heappop(self._expiry_queue)
+            entry = self.ephemeral_keys.pop(key_id, None)
+            if entry is not None:
+                # Securely wipe from memory, then recycle the arena slot
+                self._wipe(entry['key'])
+                if entry['slot'] is not None:
+                    self._freelist.append(entry['slot'])
+    
+    @staticmethod
+    def _wipe(buffer: memoryview):
+        """Zero a writable buffer in place"""
+        raw = (ctypes.c_char * len(buffer)).from_buffer(buffer)
+        ctypes.memset(ctypes.addressof(raw), 0, len(buffer))
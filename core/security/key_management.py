@@ -1,27 +1,144 @@
 # core/security/key_management.py
+import ctypes
+import json
+import os
 import secrets
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, ec
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import asyncio
 import aiosqlite
 
+KEY_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=memory",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA busy_timeout=5000"
+)
+
+KEY_DB_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS encryption_keys (
+        key_id TEXT PRIMARY KEY,
+        key_type TEXT NOT NULL,
+        encrypted_key BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        metadata TEXT,
+        status TEXT DEFAULT 'active',
+        superseded_by TEXT,
+        version INTEGER DEFAULT 1,
+        last_used REAL
+    )
+    ''',
+    '''
+    CREATE INDEX IF NOT EXISTS idx_key_status 
+    ON encryption_keys(status)
+    '''
+)
+
+class _KeyDBPool:
+    """
+    One writer connection plus a pool of read-only connections
+    Under WAL, lookups proceed concurrently with the single writer
+    """
+    
+    def __init__(self, path: str, reader_count: int):
+        self.path = path
+        self.reader_count = max(1, reader_count)
+        self._writer = None
+        self._write_lock = asyncio.Lock()
+        self._readers = asyncio.Queue()
+        self._all_readers = []
+    
+    async def open(self):
+        """Open the writer, create the schema, then open the readers"""
+        self._writer = await aiosqlite.connect(self.path)
+        await self._apply_pragmas(self._writer)
+        for statement in KEY_DB_SCHEMA:
+            await self._writer.execute(statement)
+        await self._writer.commit()
+        
+        # Readers open after the schema exists (mode=ro cannot create the file)
+        for _ in range(self.reader_count):
+            reader = await aiosqlite.connect(f"file:{self.path}?mode=ro", uri=True)
+            await self._apply_pragmas(reader)
+            self._all_readers.append(reader)
+            self._readers.put_nowait(reader)
+    
+    async def close(self):
+        """Close every connection in the pool"""
+        for reader in self._all_readers:
+            await reader.close()
+        self._all_readers.clear()
+        self._readers = asyncio.Queue()
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+    
+    @asynccontextmanager
+    async def acquire_read(self):
+        """Check out a read-only connection"""
+        reader = await self._readers.get()
+        try:
+            yield reader
+        finally:
+            self._readers.put_nowait(reader)
+    
+    @asynccontextmanager
+    async def write(self):
+        """Run a BEGIN IMMEDIATE transaction on the writer connection"""
+        async with self._write_lock:
+            await self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._writer
+            except BaseException:
+                await self._writer.rollback()
+                raise
+            await self._writer.commit()
+    
+    @staticmethod
+    async def _apply_pragmas(conn):
+        for pragma in KEY_DB_PRAGMAS:
+            await conn.execute(pragma)
+
 class KeyManagementSystem:
     """
     Enterprise Key Management System
     Implements key rotation, secure storage, and access controls
     """
     
+    # Leading byte of master-key blobs: iv(12) + ciphertext + tag
+    WRAP_FORMAT_AEAD = b'\x01'
+    
     def __init__(self, config: Dict):
         self.config = config
         self.db_path = config['encryption']['key_database']
-        self.master_key = self._load_master_key()
-        self.key_cache = {}
+        self._set_master_key(self._load_master_key())
+        # Bounded LRU of plaintext keys; evicted keys are zeroed
+        self.key_cache = OrderedDict()
+        self.key_cache_size = config['encryption'].get('key_cache_size', 1024)
         self.rotation_scheduler = KeyRotationScheduler()
         
-        # Initialize key database
-        asyncio.create_task(self._initialize_key_database())
+        # Long-lived writer + reader connections, opened by _initialize_key_database
+        self._db = _KeyDBPool(
+            self.db_path,
+            config['encryption'].get('key_db_readers', os.cpu_count() or 1)
+        )
+        self._db_ready = asyncio.Event()
+        self._init_lock = asyncio.Lock()
+    
+    async def initialize(self):
+        """Open the key database; await before first use (idempotent)"""
+        async with self._init_lock:
+            if not self._db_ready.is_set():
+                await self._initialize_key_database()
     
     async def generate_data_key(self, 
                               key_type: str = "AES-256",
@@ -57,10 +174,7 @@ class KeyManagementSystem:
         await self._store_key_record(key_record)
         
         # Cache for performance
-        self.key_cache[key_id] = {
-            'plaintext': key_material,
-            'record': key_record
-        }
+        self._cache_key(key_id, key_material, key_record)
         
         logger.info(f"🔑 Generated new data key: {key_id}")
         return key_record
@@ -68,10 +182,15 @@ class KeyManagementSystem:
     async def get_key(self, key_id: str) -> bytes:
         """
         Retrieve decrypted key material
+        
+        Callers get an immutable copy: the cached buffer is zeroed on
+        eviction and must never be shared
         """
         # Check cache first
-        if key_id in self.key_cache:
-            return self.key_cache[key_id]['plaintext']
+        cached = self.key_cache.get(key_id)
+        if cached is not None:
+            self.key_cache.move_to_end(key_id)
+            return bytes(cached['plaintext'])
         
         # Retrieve from database
         key_record = await self._retrieve_key_record(key_id)
@@ -79,15 +198,31 @@ class KeyManagementSystem:
             raise KeyError(f"Key not found: {key_id}")
         
         # Decrypt with master key
-        plaintext_key = await self._decrypt_with_master_key(key_record['encrypted_key'])
+        plaintext_key, legacy = self._unwrap_with_master_key(key_record['encrypted_key'])
+        if legacy:
+            # Upgrade pre-versioning blobs on first read
+            key_record['encrypted_key'] = await self._encrypt_with_master_key(plaintext_key)
+            await self._rewrap_key_record(key_record)
+            logger.info(f"🔑 Rewrapped legacy key blob: {key_id}")
         
         # Update cache
+        self._cache_key(key_id, plaintext_key, key_record)
+        return plaintext_key
+    
+    def _cache_key(self, key_id: str, key_material: bytes, key_record: Dict):
+        """Insert a plaintext key into the LRU cache, evicting and wiping the oldest"""
+        # bytearray so the plaintext can be zeroed on eviction
+        plaintext = bytearray(key_material)
         self.key_cache[key_id] = {
-            'plaintext': plaintext_key,
+            'plaintext': plaintext,
             'record': key_record
         }
+        self.key_cache.move_to_end(key_id)
         
-        return plaintext_key
+        while len(self.key_cache) > self.key_cache_size:
+            _, evicted = self.key_cache.popitem(last=False)
+            buffer = evicted['plaintext']
+            ctypes.memset((ctypes.c_char * len(buffer)).from_buffer(buffer), 0, len(buffer))
     
     async def rotate_key(self, key_id: str) -> str:
         """
@@ -117,37 +252,132 @@ class KeyManagementSystem:
         """
         # Implementation depends on master key storage strategy
         # This could use HSM, cloud KMS, or secure local storage
-        iv = secrets.token_bytes(16)
-        cipher = Cipher(algorithms.AES(self.master_key), modes.GCM(iv), backend=self.backend)
-        encryptor = cipher.encryptor()
+        iv = secrets.token_bytes(12)  # 96-bit GCM nonce
         
-        encrypted = encryptor.update(data) + encryptor.finalize()
-        return iv + encryptor.tag + encrypted
+        # Format byte, then one-shot AEAD: ciphertext with the 16-byte tag appended
+        return self.WRAP_FORMAT_AEAD + iv + self._master_aead.encrypt(iv, data, None)
+    
+    async def _decrypt_with_master_key(self, data: bytes) -> bytes:
+        """
+        Decrypt data encrypted with the master key
+        """
+        plaintext, _ = self._unwrap_with_master_key(data)
+        return plaintext
+    
+    def _unwrap_with_master_key(self, data: bytes) -> Tuple[bytes, bool]:
+        """
+        Decrypt a wrapped blob, returning (plaintext, is_legacy_format)
+        
+        Unversioned blobs are iv(16) + tag + ciphertext. Their random IV can
+        start with the format byte, so a failed tag check falls back to them.
+        """
+        if data[:1] == self.WRAP_FORMAT_AEAD:
+            iv, ciphertext = data[1:13], data[13:]
+            try:
+                return self._master_aead.decrypt(iv, ciphertext, None), False
+            except InvalidTag:
+                pass
+        
+        iv, tag, ciphertext = data[:16], data[16:32], data[32:]
+        decryptor = Cipher(algorithms.AES(self.master_key), modes.GCM(iv, tag)).decryptor()
+        return decryptor.update(ciphertext) + decryptor.finalize(), True
+    
+    def _set_master_key(self, master_key: bytes):
+        """
+        Install the master key and its long-lived AEAD context
+        
+        The AESGCM instance keeps the expanded key schedule and GHASH table,
+        so every wrap/unwrap reuses them. Rotating the master key must go
+        through here so the cached context is rebuilt for the new key.
+        """
+        self.master_key = master_key
+        self._master_aead = AESGCM(master_key)
     
     def _generate_key_id(self) -> str:
         """Generate unique key identifier"""
-        timestamp = int(time.time() * 1000)
-        random = secrets.token_bytes(8)
-        return f"key_{timestamp}_{random.hex()}"
+        return f"key_{time.time_ns() // 1_000_000}_{secrets.token_hex(8)}"
     
     async def _initialize_key_database(self):
         """Initialize secure key database"""
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS encryption_keys (
-                    key_id TEXT PRIMARY KEY,
-                    key_type TEXT NOT NULL,
-                    encrypted_key BLOB NOT NULL,
-                    created_at REAL NOT NULL,
-                    metadata TEXT,
-                    status TEXT DEFAULT 'active',
-                    superseded_by TEXT,
-                    version INTEGER DEFAULT 1,
-                    last_used REAL
+        await self._db.open()
+        self._db_ready.set()
+    
+    async def close(self):
+        """Close the key database connections"""
+        self._db_ready.clear()
+        await self._db.close()
+    
+    async def _store_key_record(self, key_record: Dict):
+        """Persist a new key record"""
+        if not self._db_ready.is_set():
+            await self.initialize()
+        async with self._db.write() as db:
+            await db.execute(
+                '''INSERT INTO encryption_keys
+                   (key_id, key_type, encrypted_key, created_at, metadata, status, version)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                (
+                    key_record['key_id'],
+                    key_record['key_type'],
+                    key_record['encrypted_key'],
+                    key_record['created_at'],
+                    json.dumps(key_record['metadata']),
+                    key_record['status'],
+                    key_record['version']
+                )
+            )
+    
+    async def _retrieve_key_record(self, key_id: str) -> Optional[Dict]:
+        """Load a key record by ID"""
+        if not self._db_ready.is_set():
+            await self.initialize()
+        async with self._db.acquire_read() as db:
+            async with db.execute(
+                '''SELECT key_id, key_type, encrypted_key, created_at, metadata,
+                          status, superseded_by, version
+                   FROM encryption_keys WHERE key_id = ?''',
+                (key_id,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        
+        if row is None:
+            return None
+        
+        return {
+            'key_id': row[0],
+            'key_type': row[1],
+            'encrypted_key': row[2],
+            'created_at': row[3],
+            'metadata': json.loads(row[4]) if row[4] else {},
+            'status': row[5],
+            'superseded_by': row[6],
+            'version': row[7]
+        }
+    
+    async def _rewrap_key_record(self, key_record: Dict):
+        """Persist a re-encrypted key blob for an existing key record"""
+        if not self._db_ready.is_set():
+            await self.initialize()
+        async with self._db.write() as db:
+            await db.execute(
+                'UPDATE encryption_keys SET encrypted_key = ? WHERE key_id = ?',
+                (key_record['encrypted_key'], key_record['key_id'])
+            )
+    
+    async def _update_key_record(self, key_record: Dict):
+        """Persist status/rotation changes to an existing key record"""
+        if not self._db_ready.is_set():
+            await self.initialize()
+        async with self._db.write() as db:
+            await db.execute(
+                '''UPDATE encryption_keys
+                   SET status = ?, superseded_by = ?, metadata = ?, version = ?
+                   WHERE key_id = ?''',
+                (
+                    key_record['status'],
+                    key_record.get('superseded_by'),
+                    json.dumps(key_record['metadata']),
+                    key_record['version'],
+                    key_record['key_id']
                 )
-            ''')
-            await db.execute('''
-                CREATE INDEX IF NOT EXISTS idx_key_status 
-                ON encryption_keys(status)
-            ''')
-            await db.commit()
+            )
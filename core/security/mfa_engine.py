@@ -1,7 +1,17 @@
 # core/security/mfa_engine.py
+import asyncio
+from types import MappingProxyType
+
 class MultiFactorAuthEngine:
     """Enterprise-grade MFA with multiple authentication factors"""
     
+    _RISK_FACTORS = MappingProxyType({
+        "low": ("knowledge",),  # Password only
+        "medium": ("knowledge", "possession"),  # Password + TOTP
+        "high": ("knowledge", "possession", "inherence"),  # Password + TOTP + Biometric
+        "critical": ("knowledge", "possession", "inherence", "location")  # All factors
+    })
+    
     def __init__(self, config: Dict):
         self.config = config
         self.factor_registry = self._initialize_factors()
@@ -24,11 +34,17 @@ class MultiFactorAuthEngine:
         # Determine required factors based on risk
         required_factors = self._get_required_factors(risk_level)
         
-        # Execute authentication factors
+        # Execute authentication factors concurrently; a failing validator counts as a failed factor
+        results = await asyncio.gather(
+            *(self.factor_registry[factor].validate(user_id, auth_attempt.get(factor, {}))
+              for factor in required_factors),
+            return_exceptions=True
+        )
         factor_results = {}
-        for factor in required_factors:
-            validator = self.factor_registry[factor]
-            result = await validator.validate(user_id, auth_attempt.get(factor, {}))
+        for factor, result in zip(required_factors, results):
+            if isinstance(result, BaseException):
+                logger.error(f"MFA factor {factor} validation failed: {result!r}")
+                result = False
             factor_results[factor] = result
         
         # Calculate overall authentication strength
@@ -43,13 +59,6 @@ class MultiFactorAuthEngine:
             "session_restrictions": self._get_session_restrictions(risk_level, auth_strength)
         }
     
-    async def _get_required_factors(self, risk_level: str) -> List[str]:
+    def _get_required_factors(self, risk_level: str) -> Tuple[str, ...]:
         """Determine required authentication factors based on risk"""
-        risk_based_factors = {
-            "low": ["knowledge"],  # Password only
-            "medium": ["knowledge", "possession"],  # Password + TOTP
-            "high": ["knowledge", "possession", "inherence"],  # Password + TOTP + Biometric
-            "critical": ["knowledge", "possession", "inherence", "location"]  # All factors
-        }
-        
-        return risk_based_factors.get(risk_level, ["knowledge", "possession"])
+        return self._RISK_FACTORS.get(risk_level, self._RISK_FACTORS["medium"])
@@ -1,4 +1,106 @@
 # core/security/rate_limiting.py
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+import redis.asyncio as aioredis
+
+# Atomic check-and-increment across all windows in one round-trip.
+# KEYS: one counter per window; ARGV: limits, then window lengths (seconds).
+# Returns {allowed, exceeded window index (1-based), current count}
+RATE_LIMIT_SCRIPT = """
+local n = #KEYS
+for i = 1, n do
+    local current = tonumber(redis.call('GET', KEYS[i]) or '0')
+    if current >= tonumber(ARGV[i]) then
+        return {0, i, current}
+    end
+end
+for i = 1, n do
+    if redis.call('INCR', KEYS[i]) == 1 then
+        redis.call('EXPIRE', KEYS[i], ARGV[n + i])
+    end
+end
+return {1, 0, 0}
+"""
+
+class AtomicBucket:
+    """
+    Token bucket with lazy refill
+    check() never awaits, so on the event loop it runs without a lock
+    """
+    __slots__ = ('tokens', 'last_refill', 'rate', 'capacity')
+    
+    def __init__(self, capacity: float):
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.rate = capacity
+        self.capacity = capacity
+    
+    def check(self, now: float, rate: float, capacity: float) -> bool:
+        """Take one token if available"""
+        self.rate = rate
+        self.capacity = capacity
+        tokens = min(capacity, self.tokens + (now - self.last_refill) * rate)
+        self.last_refill = now
+        if tokens >= 1:
+            self.tokens = tokens - 1
+            return True
+        self.tokens = tokens
+        return False
+    
+    def retry_after(self, rate: float) -> float:
+        """Seconds until the next token is available"""
+        return max(0.0, (1 - self.tokens) / rate) if rate > 0 else 1.0
+    
+    def is_full(self, now: float) -> bool:
+        """Whether the bucket has refilled to capacity, i.e. dropping it loses nothing"""
+        return self.tokens + (now - self.last_refill) * self.rate >= self.capacity
+
+class VegasLimiter:
+    """
+    Concurrency limiter (TCP Vegas style) driven by Little's Law
+    The inflight limit grows while latency stays near the observed minimum
+    and shrinks once requests start queueing
+    """
+    
+    def __init__(self, initial_limit: int = 20, min_limit: int = 1, max_limit: int = 1000,
+                 alpha: int = 3, beta: int = 6):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.alpha = alpha
+        self.beta = beta
+        self.inflight = 0
+        self.min_rtt = float('inf')
+    
+    def try_acquire(self) -> Optional[float]:
+        """Admit a request, returning its start time, or None when at the limit"""
+        if self.inflight >= int(self.limit):
+            return None
+        self.inflight += 1
+        return time.monotonic()
+    
+    def release(self, started_at: float, dropped: bool = False):
+        """Complete a request and adjust the limit from its round-trip time"""
+        self.inflight -= 1
+        if dropped:
+            return
+        
+        rtt = time.monotonic() - started_at
+        if rtt <= 0:
+            return
+        self.min_rtt = min(self.min_rtt, rtt)
+        
+        # Underutilized: the sample says nothing about capacity, avoid limit creep
+        if self.inflight < self.limit / 2:
+            return
+        
+        queue_size = self.limit * (1 - self.min_rtt / rtt)
+        if queue_size < self.alpha:
+            self.limit = min(self.max_limit, self.limit + 1)
+        elif queue_size > self.beta:
+            self.limit = max(self.min_limit, self.limit - 1)
+
 class AdaptiveRateLimiter:
     """
     AI-driven adaptive rate limiting based on client behavior and threat level
@@ -10,6 +112,27 @@ class AdaptiveRateLimiter:
         self.behavior_analyzer = ClientBehaviorAnalyzer()
         self.anomaly_detector = RateLimitAnomalyDetector()
         
+        # Per-second limits are enforced by in-process buckets, kept in LRU
+        # order and dropped once refilled; the longer windows use shared
+        # counters guarded by per-key sharded locks
+        self._buckets = OrderedDict()
+        self._max_buckets = config.get('rate_limit_max_buckets', 100_000)
+        self._shard_locks = [asyncio.Lock() for _ in range(256)]
+        
+        # Admission control based on observed latency rather than a static RPS
+        self.concurrency_limiter = VegasLimiter(**config.get('concurrency_limit', {}))
+        
+        # With Redis configured, the longer windows are checked and incremented
+        # atomically server-side; register_script runs it via EVALSHA
+        redis_url = config.get('redis', {}).get('url')
+        self._redis = aioredis.from_url(redis_url) if redis_url else None
+        self._rate_limit_script = self._redis.register_script(RATE_LIMIT_SCRIPT) if self._redis else None
+        self._counted_windows = [name for name in self.rate_windows if name != "second"]
+        
+        # Tier/endpoint cardinality is small: resolve each pair against the
+        # configured limits once and hand out read-only views afterwards
+        self._base_limits_cache = lru_cache(maxsize=1024)(self._resolve_base_limits)
+        
     def _initialize_rate_windows(self) -> Dict:
         return {
             "second": {"window": 1, "limits": {}},
@@ -26,22 +149,34 @@ class AdaptiveRateLimiter:
         # Adjust limits based on behavior and threat
         adaptive_limits = await self._calculate_adaptive_limits(client_id, base_limits, context)
         
-        # Check all rate windows
-        for window_name, window_config in self.rate_windows.items():
-            current_count = await self._get_request_count(client_id, endpoint, window_name)
-            window_limit = adaptive_limits[window_name]
-            
-            if current_count >= window_limit:
-                return {
-                    "allowed": False,
-                    "window": window_name,
-                    "current": current_count,
-                    "limit": window_limit,
-                    "retry_after": window_config['window']
-                }
-        
-        # Increment counters
-        await self._increment_request_counters(client_id, endpoint)
+        # Burst window: lock-free token bucket
+        bucket_key = (client_id, endpoint)
+        second_limit = adaptive_limits["second"]
+        now = time.monotonic()
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self._buckets[bucket_key] = AtomicBucket(second_limit)
+        else:
+            self._buckets.move_to_end(bucket_key)
+        self._evict_idle_buckets(now)
+        
+        if not bucket.check(now, second_limit, second_limit):
+            return {
+                "allowed": False,
+                "window": "second",
+                "current": second_limit - bucket.tokens,
+                "tokens": bucket.tokens,
+                "limit": second_limit,
+                "retry_after": bucket.retry_after(second_limit)
+            }
+        
+        # Longer windows: one atomic script call when Redis is available
+        if self._rate_limit_script is not None:
+            denied = await self._check_windows_atomic(client_id, endpoint, adaptive_limits)
+        else:
+            denied = await self._check_windows_locked(client_id, endpoint, bucket_key, adaptive_limits)
+        if denied:
+            return denied
         
         # Analyze behavior for future adjustments
         asyncio.create_task(self._analyze_client_behavior(client_id, endpoint, context))
@@ -52,6 +187,75 @@ class AdaptiveRateLimiter:
             "current_usage": await self._get_current_usage(client_id, endpoint)
         }
     
+    def _evict_idle_buckets(self, now: float):
+        """Drop full buckets from the cold end; past the cap the coldest goes regardless"""
+        buckets = self._buckets
+        while len(buckets) > 1:
+            key, bucket = next(iter(buckets.items()))
+            if not bucket.is_full(now) and len(buckets) <= self._max_buckets:
+                break
+            del buckets[key]
+    
+    async def _check_windows_atomic(self, client_id: str, endpoint: str, adaptive_limits: Dict) -> Optional[Dict]:
+        """Check and increment the minute/hour/day counters in a single Redis script call"""
+        windows = self._counted_windows
+        keys = [f"ratelimit:{client_id}:{endpoint}:{name}" for name in windows]
+        args = [adaptive_limits[name] for name in windows]
+        args += [self.rate_windows[name]['window'] for name in windows]
+        
+        allowed, exceeded, current_count = await self._rate_limit_script(keys=keys, args=args)
+        if allowed:
+            return None
+        
+        window_name = windows[exceeded - 1]
+        return {
+            "allowed": False,
+            "window": window_name,
+            "current": current_count,
+            "limit": adaptive_limits[window_name],
+            "retry_after": self.rate_windows[window_name]['window']
+        }
+    
+    async def _check_windows_locked(self, client_id: str, endpoint: str, bucket_key: tuple,
+                                    adaptive_limits: Dict) -> Optional[Dict]:
+        """Check and increment the longer windows under this key's shard lock"""
+        async with self._shard_locks[hash(bucket_key) & 0xff]:
+            for window_name, window_config in self.rate_windows.items():
+                if window_name == "second":
+                    continue
+                
+                current_count = await self._get_request_count(client_id, endpoint, window_name)
+                window_limit = adaptive_limits[window_name]
+                
+                if current_count >= window_limit:
+                    return {
+                        "allowed": False,
+                        "window": window_name,
+                        "current": current_count,
+                        "limit": window_limit,
+                        "retry_after": window_config['window']
+                    }
+            
+            # Increment counters
+            await self._increment_request_counters(client_id, endpoint)
+        
+        return None
+    
+    def _get_base_limits(self, tier: str, endpoint: str) -> MappingProxyType:
+        """Get base limits for a client tier and endpoint (memoized, read-only)"""
+        return self._base_limits_cache(tier, endpoint)
+    
+    def _resolve_base_limits(self, tier: str, endpoint: str) -> MappingProxyType:
+        """Per-window limits from config['rate_limits']: tier limits, scaled by endpoint prefix"""
+        rate_config = self.config['rate_limits']
+        tiers = rate_config['tiers']
+        limits = tiers.get(tier) or tiers[rate_config.get('default_tier', 'basic')]
+        
+        for prefix, scale in rate_config.get('endpoint_scale', {}).items():
+            if endpoint.startswith(prefix):
+                return MappingProxyType({window: max(1, int(limit * scale)) for window, limit in limits.items()})
+        return MappingProxyType(dict(limits))
+    
     async def _calculate_adaptive_limits(self, client_id: str, base_limits: Dict, context: APISecurityContext) -> Dict:
         """Calculate adaptive limits based on client behavior"""
         behavior_profile = await self.behavior_analyzer.get_behavior_profile(client_id)
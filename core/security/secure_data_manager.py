@@ -1,4 +1,48 @@
 # core/security/secure_data_manager.py
+try:
+    import orjson
+    
+    def _json_dumps(obj, sort_keys: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes (Rust/SIMD encoder)"""
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    
+    def _json_dumps(obj, sort_keys: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes (stdlib fallback, same compact output as orjson)"""
+        return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    
+    _json_loads = json.loads
+
+import re
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+PII_INDICATORS = ('phone', 'email', 'address', 'location', 'user_id', 'username')
+
+# Sensitivity indicator bits produced by a single pass over the document
+INDICATOR_PII = 1
+INDICATOR_COMMUNICATION = 2
+INDICATOR_INTELLIGENCE = 4
+INDICATOR_OPERATIONAL = 8
+ALL_INDICATORS = INDICATOR_PII | INDICATOR_COMMUNICATION | INDICATOR_INTELLIGENCE | INDICATOR_OPERATIONAL
+
+# classification_rules sections that feed each indicator bit
+INDICATOR_RULES = {
+    INDICATOR_PII: 'personal_identifiers',
+    INDICATOR_COMMUNICATION: 'communication_content',
+    INDICATOR_INTELLIGENCE: 'intelligence_data',
+    INDICATOR_OPERATIONAL: 'operational_secrets'
+}
+
 class SecureDataManager:
     """
     High-level interface for secure data management
@@ -17,18 +61,18 @@ class SecureDataManager:
         sensitivity = await self.sensitivity_classifier.classify_data(data, context)
         
         # Serialize to bytes
-        plaintext = json.dumps(data, sort_keys=True).encode('utf-8')
+        plaintext = _json_dumps(data, sort_keys=True)
         
-        # Encrypt with appropriate layers
-        encryption_result = await self.encryption_engine.encrypt_data(
+        # Encrypt in a single AEAD pass; sensitivity is bound into the AAD
+        encryption_result = await self.encryption_engine.fused_encrypt(
             plaintext, sensitivity
         )
         
-        # Prepare storage record
+        # Prepare storage record; binary fields are kept raw for BLOB columns
         storage_record = {
-            'encrypted_data': base64.b64encode(encryption_result.encrypted_data).decode(),
-            'iv': base64.b64encode(encryption_result.iv).decode(),
-            'tag': base64.b64encode(encryption_result.tag).decode() if encryption_result.tag else None,
+            'encrypted_data': encryption_result.encrypted_data,
+            'iv': encryption_result.iv,
+            'tag': encryption_result.tag,
             'key_id': encryption_result.key_id,
             'encryption_metadata': encryption_result.encryption_metadata,
             'sensitivity': sensitivity.value,
@@ -44,14 +88,10 @@ class SecureDataManager:
         """
         try:
             # Reconstruct encryption result
-            encrypted_data = base64.b64decode(storage_record['encrypted_data'])
-            iv = base64.b64decode(storage_record['iv'])
-            tag = base64.b64decode(storage_record['tag']) if storage_record.get('tag') else None
-            
             encryption_result = EncryptionResult(
-                encrypted_data=encrypted_data,
-                iv=iv,
-                tag=tag,
+                encrypted_data=bytes(storage_record['encrypted_data']),
+                iv=bytes(storage_record['iv']),
+                tag=bytes(storage_record['tag']) if storage_record.get('tag') else None,
                 key_id=storage_record['key_id'],
                 encryption_metadata=storage_record['encryption_metadata']
             )
@@ -60,7 +100,7 @@ class SecureDataManager:
             plaintext = await self.encryption_engine.decrypt_data(encryption_result)
             
             # Deserialize from bytes
-            data = json.loads(plaintext.decode('utf-8'))
+            data = _json_loads(plaintext)
             
             return data
             
@@ -75,21 +115,18 @@ class DataSensitivityClassifier:
     
     def __init__(self):
         self.classification_rules = self._load_classification_rules()
+        self._indicator_tokens = self._build_token_masks(self._indicator_token_lists(self.classification_rules))
+        self._indicator_ac = self._build_automaton(self._indicator_tokens)
+        self._indicator_re = self._build_token_regex(self._indicator_tokens)
     
     async def classify_data(self, data: Dict, context: str) -> SensitivityLevel:
         """Classify data sensitivity based on content and context"""
         
-        sensitivity_indicators = {
-            'personal_identifiers': self._contains_pii(data),
-            'communication_content': self._analyze_communication_sensitivity(data),
-            'intelligence_data': self._assess_intelligence_value(data, context),
-            'operational_secrets': self._contains_operational_data(data)
-        }
+        # One traversal yields all four indicators as a bitmask
+        indicators = self._scan_indicators(data, context)
         
         # Score based on indicators
-        sensitivity_score = sum(
-            1 for indicator, present in sensitivity_indicators.items() if present
-        )
+        sensitivity_score = bin(indicators).count("1")
         
         if sensitivity_score >= 3:
             return SensitivityLevel.CRITICAL
@@ -100,8 +137,89 @@ class DataSensitivityClassifier:
         else:
             return SensitivityLevel.LOW
     
-    def _contains_pii(self, data: Dict) -> bool:
-        """Check for Personally Identifiable Information"""
-        pii_indicators = ['phone', 'email', 'address', 'location', 'user_id', 'username']
-        data_str = json.dumps(data).lower()
-        return any(indicator in data_str for indicator in pii_indicators)
+    def _scan_indicators(self, data: Dict, context: str) -> int:
+        """Walk the document once and collect sensitivity indicator bits"""
+        found = 0
+        if context:
+            # Context only informs intelligence value
+            found = self._match_mask(context.lower(), values=True) & INDICATOR_INTELLIGENCE
+        
+        stack = [data]
+        while stack and found != ALL_INDICATORS:
+            node = stack.pop()
+            if isinstance(node, dict):
+                for key, value in node.items():
+                    if isinstance(key, str):
+                        found |= self._match_mask(key.lower(), values=False)
+                    if isinstance(value, str):
+                        found |= self._match_mask(value.lower(), values=True)
+                    elif isinstance(value, (dict, list)):
+                        stack.append(value)
+            elif isinstance(node, list):
+                for item in node:
+                    if isinstance(item, str):
+                        found |= self._match_mask(item.lower(), values=True)
+                    elif isinstance(item, (dict, list)):
+                        stack.append(item)
+        
+        return found
+    
+    def _match_mask(self, text: str, values: bool) -> int:
+        """Indicator bits for every whole token found in text (PII only counts on field names)"""
+        mask = 0
+        if self._indicator_ac is not None:
+            for end, (token_mask, length) in self._indicator_ac.iter(text):
+                start = end - length + 1
+                if _is_word_boundary(text, start - 1) and _is_word_boundary(text, end + 1):
+                    mask |= token_mask
+        elif self._indicator_re is not None:
+            for match in self._indicator_re.finditer(text):
+                mask |= self._indicator_tokens[match.group(0)]
+        
+        return mask & ~INDICATOR_PII if values else mask
+    
+    @staticmethod
+    def _indicator_token_lists(classification_rules: Dict) -> Dict[int, List[str]]:
+        """Token lists per indicator bit from the classification rules; PII defaults to the built-in identifiers"""
+        token_lists = {}
+        for bit, section in INDICATOR_RULES.items():
+            tokens = (classification_rules or {}).get(section)
+            if tokens is None and bit == INDICATOR_PII:
+                tokens = PII_INDICATORS
+            token_lists[bit] = [token.lower() for token in tokens or ()]
+        return token_lists
+    
+    @staticmethod
+    def _build_token_masks(indicator_tokens: Dict) -> Dict[str, int]:
+        """Map each token to the OR of the indicator bits it belongs to"""
+        token_masks = {}
+        for bit, tokens in indicator_tokens.items():
+            for token in tokens:
+                token_masks[token] = token_masks.get(token, 0) | bit
+        return token_masks
+    
+    @staticmethod
+    def _build_automaton(token_masks: Dict[str, int]):
+        """Compile tokens into an Aho-Corasick automaton (None without pyahocorasick)"""
+        if ahocorasick is None:
+            return None
+        if not token_masks:
+            return None
+        automaton = ahocorasick.Automaton()
+        for token, mask in token_masks.items():
+            automaton.add_word(token, (mask, len(token)))
+        automaton.make_automaton()
+        return automaton
+    
+    @staticmethod
+    def _build_token_regex(token_masks: Dict[str, int]):
+        """Whole-token alternation used when pyahocorasick is unavailable"""
+        if not token_masks:
+            return None
+        # Longest first so a token never shadows a longer one sharing its prefix
+        alternation = "|".join(re.escape(token) for token in sorted(token_masks, key=len, reverse=True))
+        return re.compile(rf"(?<![^\W_])(?:{alternation})(?![^\W_])")
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    """True when index falls outside text or on a non-alphanumeric character"""
+    return index < 0 or index >= len(text) or not text[index].isalnum()
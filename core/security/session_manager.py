@@ -1,22 +1,49 @@
 # core/security/session_manager.py
+from collections import OrderedDict
+import time
+
 class SecureSessionManager:
     """Enterprise session management with advanced security controls"""
     
+    MONITOR_INTERVAL = 60  # seconds; one wheel slot per second
+    MONITOR_CONCURRENCY = 64  # session checks in flight at once
+    SESSION_LIFETIME = 8 * 3600  # seconds
+    
     def __init__(self, config: Dict):
         self.config = config
-        self.active_sessions = {}
         self.session_store = EncryptedSessionStore()
         self.threat_detector = SessionThreatDetector()
         
+        # The encrypted store is the record of truth; recently used sessions
+        # are kept in a bounded in-process LRU in front of it as
+        # (session, monotonic expiry, monotonic cached-at) entries. Entries are
+        # only trusted for a short TTL so revocations made by other processes
+        # are picked up from the store
+        self._session_hot = OrderedDict()
+        self._session_hot_size = config.get('session_hot_size', 4096)
+        self._session_hot_ttl = config.get('session_hot_ttl', 5.0)
+        
+        # Hashed wheel: every monitored session sits in exactly one slot and
+        # is checked once per revolution by a single loop task
+        self._monitor_wheel = [[] for _ in range(self.MONITOR_INTERVAL)]
+        self._wheel_cursor = 0
+        self._monitor_task = None
+        self._monitor_semaphore = asyncio.Semaphore(config.get('monitor_concurrency', self.MONITOR_CONCURRENCY))
+        self._monitor_checks = set()
+        
     async def create_secure_session(self, auth_result: Dict) -> Session:
         """Create a secure session with comprehensive controls"""
         session_id = self._generate_secure_session_id()
         
+        # Wall-clock times are kept for audit; expiry checks use the monotonic clock
+        created_at = datetime.now()
+        expires_mono = time.monotonic() + self.SESSION_LIFETIME
+        
         session = Session(
             session_id=session_id,
             user_id=auth_result['user_id'],
-            created_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(hours=8),
+            created_at=created_at,
+            expires_at=created_at + timedelta(seconds=self.SESSION_LIFETIME),
             roles=auth_result['assigned_roles'],
             context={
                 'ip_address': auth_result.get('ip_address'),
@@ -32,28 +59,38 @@ class SecureSessionManager:
         
         # Store encrypted session
         await self.session_store.store_session(session)
+        self._remember_session(session, expires_mono)
         
-        # Start session monitoring
-        asyncio.create_task(self._monitor_session_security(session))
+        # Schedule session monitoring one revolution from now
+        self._schedule_monitoring(session, expires_mono)
         
         return session
     
     async def validate_session(self, session_token: str) -> Optional[Session]:
         """Validate session with comprehensive security checks"""
-        session = await self.session_store.retrieve_session(session_token)
-        
-        if not session:
-            return None
+        now = time.monotonic()
+        entry = self._session_hot.get(session_token)
+        if entry is not None and now - entry[2] > self._session_hot_ttl:
+            self._session_hot.pop(session_token, None)
+            entry = None
+        if entry is not None:
+            session, expires_mono, _ = entry
+        else:
+            session = await self.session_store.retrieve_session(session_token)
+            if not session:
+                return None
+            # Anchor the stored wall-clock expiry to the monotonic clock once
+            expires_mono = now + (session.expires_at - datetime.now()).total_seconds()
         
         # Check session expiration
-        if datetime.now() > session.expires_at:
-            await self._terminate_session(session_token)
+        if now > expires_mono:
+            await self.end_session(session_token)
             return None
         
         # Check for suspicious activity
         threat_detected = await self.threat_detector.analyze_session_activity(session)
         if threat_detected:
-            await self._terminate_session(session_token)
+            await self.end_session(session_token)
             await self._alert_security_team(session, threat_detected)
             return None
         
@@ -64,30 +101,83 @@ class SecureSessionManager:
         # Update last activity
         session.last_activity = datetime.now()
         await self.session_store.update_session(session)
+        self._remember_session(session, expires_mono)
         
         return session
     
-    async def _monitor_session_security(self, session: Session):
-        """Continuous session security monitoring"""
-        while datetime.now() < session.expires_at:
+    def _remember_session(self, session: Session, expires_mono: float):
+        """Insert or refresh a session in the hot-set, evicting the least recently used"""
+        self._session_hot[session.session_id] = (session, expires_mono, time.monotonic())
+        self._session_hot.move_to_end(session.session_id)
+        if len(self._session_hot) > self._session_hot_size:
+            self._session_hot.popitem(last=False)
+    
+    async def end_session(self, session_id: str):
+        """Evict a session from the hot-set and terminate it in the store"""
+        self._session_hot.pop(session_id, None)
+        await self._terminate_session(session_id)
+    
+    async def _demand_reauthentication(self, session_id: str):
+        """Evict a session from the hot-set and force the user to reauthenticate"""
+        self._session_hot.pop(session_id, None)
+        await self._force_reauthentication(session_id)
+    
+    def _schedule_monitoring(self, session: Session, expires_mono: float):
+        """Place a session on the monitor wheel, starting the loop if needed"""
+        self._monitor_wheel[self._wheel_cursor].append((session, expires_mono))
+        
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._monitor_loop())
+    
+    async def _monitor_loop(self):
+        """Advance the wheel once per second and dispatch checks for the sessions that are due"""
+        while True:
+            await asyncio.sleep(1)
+            self._wheel_cursor = (self._wheel_cursor + 1) % self.MONITOR_INTERVAL
+            
+            due = self._monitor_wheel[self._wheel_cursor]
+            if not due:
+                continue
+            self._monitor_wheel[self._wheel_cursor] = []
+            
+            # Checks run as tasks so a slow slot never delays the wheel
+            for entry in due:
+                check = asyncio.create_task(self._run_monitor_check(entry))
+                self._monitor_checks.add(check)
+                check.add_done_callback(self._monitor_checks.discard)
+    
+    async def _run_monitor_check(self, entry: Tuple):
+        """Check one session under the concurrency bound and reschedule it if still watched"""
+        session, expires_mono = entry
+        async with self._monitor_semaphore:
             try:
-                # Check for geographic anomalies
-                if await self._detect_geographic_anomaly(session):
-                    await self._force_reauthentication(session.session_id)
-                    break
-                
-                # Check for behavior anomalies
-                if await self._detect_behavioral_anomaly(session):
-                    await self._force_reauthentication(session.session_id)
-                    break
-                
-                # Check for device changes
-                if await self._detect_device_change(session):
-                    await self._terminate_session(session.session_id)
-                    break
-                
-                await asyncio.sleep(60)  # Check every minute
-                
+                keep = await self._monitor_session_security(session, expires_mono)
             except Exception as e:
                 logger.error(f"Session monitoring error: {e}")
-                await asyncio.sleep(30)
+                keep = time.monotonic() < expires_mono
+        
+        # Sessions still under watch go back into the current slot, i.e. one revolution later
+        if keep:
+            self._monitor_wheel[self._wheel_cursor].append(entry)
+    
+    async def _monitor_session_security(self, session: Session, expires_mono: float) -> bool:
+        """Run one round of session security checks; returns whether to keep monitoring"""
+        if time.monotonic() >= expires_mono:
+            return False
+        
+        # Check for geographic anomalies
+        if await self._detect_geographic_anomaly(session):
+            await self._demand_reauthentication(session.session_id)
+            return False
+        
+        # Check for behavior anomalies
+        if await self._detect_behavioral_anomaly(session):
+            await self._demand_reauthentication(session.session_id)
+            return False
+        
+        # Check for device changes
+        if await self._detect_device_change(session):
+            await self.end_session(session.session_id)
+            return False
+        
+        return True
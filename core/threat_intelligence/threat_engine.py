@@ -3,7 +3,94 @@ import asyncio
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import aiohttp
+import hashlib
 import json
+import time
+import zlib
+import numpy as np
+from cachetools import LFUCache
+
+# Campaign/behavior features are hashed tokens (tactics, indicators) in a fixed-width space
+CAMPAIGN_FEATURE_DIM = 256
+CAMPAIGN_SIMILARITY_THRESHOLD = 0.7
+
+# Where each feature family comes from: campaigns carry tactics/indicators,
+# user behavior records carry observed behaviors and raw IOCs
+CAMPAIGN_FEATURE_FIELDS = {
+    'tactic': ('tactics',),
+    'indicator': ('indicators',)
+}
+BEHAVIOR_FEATURE_FIELDS = {
+    'tactic': ('tactics', 'behaviors'),
+    'indicator': ('indicators', 'ip_addresses', 'domains', 'hashes')
+}
+
+_SUFFIX_TERMINAL = object()
+
+def _feature_token(item) -> str:
+    """Normalize one tactic/indicator; structured indicators use their value when present"""
+    if isinstance(item, dict):
+        item = item.get('value', item)
+    if not isinstance(item, str):
+        item = json.dumps(item, sort_keys=True, default=str)
+    return item.strip().lower()
+
+class IOCIndex:
+    """
+    Hash-set index over IOC feeds
+    Membership is O(1) per input indicator regardless of feed size;
+    wildcard domains ("*.bad.example") live in a reversed-label trie
+    """
+    
+    def __init__(self):
+        self.ip_set = frozenset()
+        self.domain_set = frozenset()
+        self.hash_set = frozenset()
+        self._domain_suffixes = {}
+    
+    def rebuild(self, ips: List[str], domains: List[str], hashes: List[str]):
+        """Rebuild the index from a fresh feed snapshot"""
+        self.ip_set = frozenset(ips)
+        self.hash_set = frozenset(h.lower() for h in hashes)
+        
+        exact_domains = set()
+        suffixes = {}
+        for domain in domains:
+            domain = domain.lower().rstrip('.')
+            if domain.startswith('*.'):
+                node = suffixes
+                for label in reversed(domain[2:].split('.')):
+                    node = node.setdefault(label, {})
+                node[_SUFFIX_TERMINAL] = True
+            else:
+                exact_domains.add(domain)
+        
+        self.domain_set = frozenset(exact_domains)
+        self._domain_suffixes = suffixes
+    
+    def match_ips(self, ips: List[str]) -> List[str]:
+        return [ip for ip in ips if ip in self.ip_set]
+    
+    def match_hashes(self, hashes: List[str]) -> List[str]:
+        return [h for h in hashes if h.lower() in self.hash_set]
+    
+    def match_domains(self, domains: List[str]) -> List[str]:
+        return [domain for domain in domains if self._domain_matches(domain.lower().rstrip('.'))]
+    
+    def _domain_matches(self, domain: str) -> bool:
+        if domain in self.domain_set:
+            return True
+        
+        # Walk labels right to left; a terminal above the leaf is a wildcard hit
+        node = self._domain_suffixes
+        labels = domain.split('.')
+        for depth, label in enumerate(reversed(labels), 1):
+            node = node.get(label)
+            if node is None:
+                return False
+            if _SUFFIX_TERMINAL in node and depth < len(labels):
+                return True
+        return False
 
 class ThreatIntelligenceEngine:
     """
@@ -15,7 +102,53 @@ class ThreatIntelligenceEngine:
         self.intel_sources = self._initialize_intel_sources()
         self.correlation_engine = ThreatCorrelationEngine(config)
         self.ioc_manager = IOCManager(config)
+        self.ioc_index = IOCIndex()
+        self._ioc_refresh_interval = config.get('ioc_refresh_interval', 300)
+        self._ioc_refresh_task = None
+        
+        # Campaign feature matrix, rebuilt whenever active campaigns are refreshed.
+        # Feeds are polled on a timer, never on the correlation hot path
+        self._campaign_refresh_interval = config.get('campaign_refresh_interval', 300)
+        self._campaigns_refreshed_at = None
+        self._campaign_refresh_lock = asyncio.Lock()
+        self._campaign_refresh_task = None
+        self._campaigns = []
+        self._campaign_matrix = np.zeros((0, CAMPAIGN_FEATURE_DIM), dtype=np.float32)
+        self._campaign_norms = np.zeros(0, dtype=np.float32)
+        self._campaign_fingerprint = None
         
+        # Correlation results per behavior vector; a few hot behaviors dominate,
+        # so frequency beats recency for eviction. Cleared when campaigns change
+        self._correlation_cache = LFUCache(maxsize=config.get('campaign_similarity_cache_size', 10_000))
+        
+    async def initialize_intel_sources(self):
+        """Load the IOC index and keep it in step with the IOC manager's feed"""
+        await self.refresh_ioc_feed()
+        if self._ioc_refresh_task is None or self._ioc_refresh_task.done():
+            self._ioc_refresh_task = asyncio.create_task(self._ioc_refresh_loop())
+        
+        await self._refresh_campaigns_if_stale()
+        if self._campaign_refresh_task is None or self._campaign_refresh_task.done():
+            self._campaign_refresh_task = asyncio.create_task(self._campaign_refresh_loop())
+    
+    async def refresh_ioc_feed(self):
+        """Pull the current IOC feed and rebuild the index from it"""
+        feed = await self.ioc_manager.refresh_feed()
+        self.load_ioc_feed(feed)
+        logger.info(
+            f"🎯 IOC index rebuilt: {len(self.ioc_index.ip_set)} IPs, "
+            f"{len(self.ioc_index.hash_set)} hashes"
+        )
+    
+    async def _ioc_refresh_loop(self):
+        """Periodically refresh the IOC index; a failed refresh keeps the previous snapshot"""
+        while True:
+            await asyncio.sleep(self._ioc_refresh_interval)
+            try:
+                await self.refresh_ioc_feed()
+            except Exception as e:
+                logger.error(f"IOC feed refresh failed: {e}")
+    
     def _initialize_intel_sources(self) -> Dict:
         """Initialize multiple threat intelligence sources"""
         return {
@@ -53,35 +186,114 @@ class ThreatIntelligenceEngine:
     
     async def _correlate_with_campaigns(self, user_behavior: Dict) -> List[Dict]:
         """Correlate with known threat campaigns"""
-        campaigns = await self._get_active_campaigns()
+        # Cached results stay valid until _index_campaigns sees a new campaign set
+        user_vec = self._vectorize(user_behavior, BEHAVIOR_FEATURE_FIELDS)
+        cache_key = user_vec.tobytes()
+        cached = self._correlation_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        await self._refresh_campaigns_if_stale()
+        
+        # Cosine similarity against every campaign in one matrix-vector product
+        user_norm = np.linalg.norm(user_vec)
+        if not self._campaigns or user_norm == 0:
+            return []
+        scores = (self._campaign_matrix @ user_vec) / (self._campaign_norms * user_norm + 1e-9)
         
         correlated_campaigns = []
-        for campaign in campaigns:
-            similarity_score = self._calculate_campaign_similarity(user_behavior, campaign)
-            if similarity_score > 0.7:
-                correlated_campaigns.append({
-                    "campaign": campaign['name'],
-                    "similarity_score": similarity_score,
-                    "attribution": campaign.get('attribution', 'Unknown'),
-                    "tactics": campaign.get('tactics', []),
-                    "indicators": campaign.get('indicators', [])
-                })
-        
-        return correlated_campaigns
+        for idx in np.nonzero(scores > CAMPAIGN_SIMILARITY_THRESHOLD)[0]:
+            campaign = self._campaigns[idx]
+            correlated_campaigns.append({
+                "campaign": campaign['name'],
+                "similarity_score": float(scores[idx]),
+                "attribution": campaign.get('attribution', 'Unknown'),
+                "tactics": campaign.get('tactics', []),
+                "indicators": campaign.get('indicators', [])
+            })
+        
+        self._correlation_cache[cache_key] = correlated_campaigns
+        return list(correlated_campaigns)
+    
+    async def _refresh_campaigns_if_stale(self):
+        """Poll the campaign feeds when the last refresh is older than the refresh interval"""
+        async with self._campaign_refresh_lock:
+            refreshed_at = self._campaigns_refreshed_at
+            if refreshed_at is not None and time.monotonic() - refreshed_at < self._campaign_refresh_interval:
+                return
+            await self._get_active_campaigns()
+            self._campaigns_refreshed_at = time.monotonic()
+    
+    async def _campaign_refresh_loop(self):
+        """Periodically re-poll campaign feeds; a failed refresh keeps the current matrix"""
+        while True:
+            await asyncio.sleep(self._campaign_refresh_interval)
+            try:
+                await self._refresh_campaigns_if_stale()
+            except Exception as e:
+                logger.error(f"Campaign refresh failed: {e}")
     
     async def _get_active_campaigns(self) -> List[Dict]:
         """Get active threat campaigns from all sources"""
         all_campaigns = []
         
-        for source_name, source in self.intel_sources.items():
-            try:
-                campaigns = await source.get_active_campaigns()
-                all_campaigns.extend(campaigns)
-            except Exception as e:
-                logger.error(f"Failed to get campaigns from {source_name}: {e}")
+        # Query all sources concurrently; one failing feed doesn't cancel the others
+        results = await asyncio.gather(
+            *(source.get_active_campaigns() for source in self.intel_sources.values()),
+            return_exceptions=True
+        )
+        
+        for source_name, campaigns in zip(self.intel_sources, results):
+            if isinstance(campaigns, Exception):
+                logger.error(f"Failed to get campaigns from {source_name}: {campaigns}")
+                continue
+            all_campaigns.extend(campaigns)
         
         # Deduplicate and prioritize campaigns
-        return self._deduplicate_campaigns(all_campaigns)
+        campaigns = self._deduplicate_campaigns(all_campaigns)
+        self._index_campaigns(campaigns)
+        return campaigns
+    
+    @staticmethod
+    def _deduplicate_campaigns(campaigns: List[Dict]) -> List[Dict]:
+        """Collapse campaigns reported by several feeds, keeping the highest-confidence copy"""
+        seen = {}
+        for campaign in campaigns:
+            key = (campaign.get('name'), campaign.get('attribution'))
+            current = seen.get(key)
+            if current is None or campaign.get('confidence', 0) > current.get('confidence', 0):
+                seen[key] = campaign
+        return list(seen.values())
+    
+    def _index_campaigns(self, campaigns: List[Dict]):
+        """Rebuild the campaign feature matrix and row norms when the campaign set changed"""
+        # Content hash over a canonical serialization; indicators may be dicts or lists
+        fingerprint = hashlib.blake2b(json.dumps(
+            [[c.get('name'), c.get('attribution'), c.get('tactics', []), c.get('indicators', [])] for c in campaigns],
+            sort_keys=True, default=str
+        ).encode(), digest_size=16).digest()
+        if fingerprint == self._campaign_fingerprint:
+            return
+        
+        self._campaign_fingerprint = fingerprint
+        self._correlation_cache.clear()
+        self._campaigns = campaigns
+        if campaigns:
+            self._campaign_matrix = np.stack([self._vectorize(c, CAMPAIGN_FEATURE_FIELDS) for c in campaigns])
+        else:
+            self._campaign_matrix = np.zeros((0, CAMPAIGN_FEATURE_DIM), dtype=np.float32)
+        self._campaign_norms = np.linalg.norm(self._campaign_matrix, axis=1)
+    
+    @staticmethod
+    def _vectorize(record: Dict, feature_fields: Dict) -> np.ndarray:
+        """Hash a record's tactic and indicator tokens into a fixed-width count vector"""
+        vec = np.zeros(CAMPAIGN_FEATURE_DIM, dtype=np.float32)
+        for family, fields in feature_fields.items():
+            for field in fields:
+                for item in record.get(field) or ():
+                    token = f"{family}:{_feature_token(item)}"
+                    vec[zlib.crc32(token.encode()) % CAMPAIGN_FEATURE_DIM] += 1.0
+        return vec
     
     async def check_ioc_matches(self, indicators: Dict) -> Dict:
         """Check Indicators of Compromise against threat intelligence"""
@@ -97,6 +309,26 @@ class ThreatIntelligenceEngine:
             "detailed_matches": ioc_matches,
             "confidence_score": self._calculate_ioc_confidence(ioc_matches)
         }
+    
+    def load_ioc_feed(self, feed: Dict):
+        """Rebuild the IOC index after an IOC feed refresh"""
+        self.ioc_index.rebuild(
+            feed.get('ip_addresses', []),
+            feed.get('domains', []),
+            feed.get('hashes', [])
+        )
+    
+    async def _check_ip_indicators(self, ips: List[str]) -> List[str]:
+        """Match IP addresses against the IOC index"""
+        return self.ioc_index.match_ips(ips)
+    
+    async def _check_domain_indicators(self, domains: List[str]) -> List[str]:
+        """Match domains (exact and wildcard) against the IOC index"""
+        return self.ioc_index.match_domains(domains)
+    
+    async def _check_hash_indicators(self, hashes: List[str]) -> List[str]:
+        """Match file hashes against the IOC index"""
+        return self.ioc_index.match_hashes(hashes)
 
 class ThreatCorrelationEngine:
     """Correlate threats across multiple dimensions"""
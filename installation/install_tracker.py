@@ -1,103 +1,182 @@
 # installation/install_tracker.py
-import json
+import atexit
+import functools
 import os
 import sqlite3
 from datetime import datetime
 import shutil
 from pathlib import Path
 import platform
+import threading
+import time
+from types import MappingProxyType
+
+try:
+    import orjson
+    
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes (Rust encoder)"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    
+    def _json_dumps(obj, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes (stdlib fallback)"""
+        return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+    
+    _json_loads = json.loads
+
+TERMUX_PREFIX = os.environ.get('PREFIX', '')
+
+@functools.lru_cache(maxsize=1)
+def _system_info() -> MappingProxyType:
+    """Probe platform details once per process (several calls read /proc or spawn uname)"""
+    return MappingProxyType({
+        "os": platform.system(),
+        "os_version": platform.version(),
+        "architecture": platform.architecture(),
+        "processor": platform.processor(),
+        "hostname": platform.node(),
+        "username": os.getenv('USER') or os.getenv('USERNAME'),
+        "wsl": "microsoft" in platform.release().lower(),
+        "termux": "com.termux" in TERMUX_PREFIX
+    })
+
+METRICS_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS install_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    start_time TEXT,
+    end_time TEXT,
+    duration_seconds REAL DEFAULT 0,
+    messages_processed INTEGER DEFAULT 0,
+    users_analyzed INTEGER DEFAULT 0,
+    analysis_run INTEGER DEFAULT 0,
+    stats TEXT
+);
+"""
 
 class InstallationTracker:
+    SAVE_DELAY = 1.0  # seconds; rapid updates coalesce into one JSON export
+    
     def __init__(self, base_path: str):
         self.base_path = Path(base_path)
         self.metrics_file = self.base_path / "config" / "installation_metrics.json"
+        self.metrics_db = self.base_path / "config" / "installation_metrics.db"
         self.ensure_directories()
         
+        # SQLite (WAL) is the store of record; the JSON file is an export
+        # for shell tooling (uninstall.sh), written behind a short debounce
+        self._db_lock = threading.Lock()
+        self._db = self._open_metrics_db()
+        self._migrate_json_metrics()
+        
+        self._dirty = False
+        self._save_timer = None
+        self._save_lock = threading.Lock()
+        atexit.register(self._flush)
+        
     def ensure_directories(self):
         """Ensure required directories exist"""
         (self.base_path / "config").mkdir(parents=True, exist_ok=True)
         (self.base_path / "logs").mkdir(parents=True, exist_ok=True)
     
+    def _open_metrics_db(self) -> sqlite3.Connection:
+        """Open the metrics database in WAL mode"""
+        conn = sqlite3.connect(self.metrics_db, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(METRICS_DB_SCHEMA)
+        return conn
+    
+    def _migrate_json_metrics(self):
+        """Import a pre-existing JSON metrics file into an empty database"""
+        if not self.metrics_file.exists():
+            return
+        with self._db_lock:
+            if self._db.execute("SELECT 1 FROM install_meta LIMIT 1").fetchone():
+                return
+        try:
+            metrics = _json_loads(self.metrics_file.read_bytes())
+        except:
+            return
+        
+        self._write_meta(metrics)
+        with self._db_lock:
+            for session in metrics.get("sessions", []):
+                self._db.execute(
+                    "INSERT OR IGNORE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (session["session_id"], session.get("start_time"), session.get("end_time"),
+                     session.get("duration_seconds", 0), session.get("messages_processed", 0),
+                     session.get("users_analyzed", 0), session.get("analysis_run", 0),
+                     _json_dumps(session).decode())
+                )
+    
     def record_installation(self):
         """Record installation details"""
         install_data = {
             "installation_date": datetime.now().isoformat(),
+            "installation_epoch": time.time(),
             "system_info": self._get_system_info(),
             "installation_path": str(self.base_path),
             "python_version": platform.python_version(),
             "platform": platform.platform(),
             "user_home": str(Path.home()),
             "total_disk_space": self._get_disk_space(),
-            "first_run": True,
-            "sessions": [],
-            "user_metrics": {
-                "total_messages_processed": 0,
-                "total_users_analyzed": 0,
-                "total_analysis_run": 0,
-                "total_runtime_seconds": 0
-            }
+            "first_run": True
         }
         
-        self._save_metrics(install_data)
+        self._write_meta(install_data)
+        self._save_metrics()
+        self._flush()
         self._create_uninstall_script()
         
     def record_session_start(self):
         """Record session start"""
-        metrics = self._load_metrics()
-        session_id = f"session_{len(metrics.get('sessions', [])) + 1}"
+        with self._db_lock:
+            # MAX(rowid) reads the last b-tree entry; COUNT(*) would scan every session
+            last_rowid = self._db.execute("SELECT COALESCE(MAX(rowid), 0) FROM sessions").fetchone()[0]
+            session_id = f"session_{last_rowid + 1}"
+            self._db.execute(
+                "INSERT INTO sessions (session_id, start_time) VALUES (?, ?)",
+                (session_id, datetime.now().isoformat())
+            )
         
-        session_data = {
-            "session_id": session_id,
-            "start_time": datetime.now().isoformat(),
-            "end_time": None,
-            "duration_seconds": 0,
-            "messages_processed": 0,
-            "users_analyzed": 0
-        }
-        
-        metrics.setdefault("sessions", []).append(session_data)
-        metrics["current_session"] = session_id
-        self._save_metrics(metrics)
+        self._write_meta({"current_session": session_id})
+        self._save_metrics()
         
         return session_id
     
     def record_session_end(self, session_id: str, stats: Dict):
         """Record session end with statistics"""
-        metrics = self._load_metrics()
+        end_dt = datetime.now()
         
-        for session in metrics.get("sessions", []):
-            if session["session_id"] == session_id:
-                session["end_time"] = datetime.now().isoformat()
-                start_dt = datetime.fromisoformat(session["start_time"])
-                end_dt = datetime.fromisoformat(session["end_time"])
-                session["duration_seconds"] = (end_dt - start_dt).total_seconds()
-                
-                # Update session stats
-                session.update(stats)
-                
-                # Update global metrics
-                metrics["user_metrics"]["total_messages_processed"] += stats.get("messages_processed", 0)
-                metrics["user_metrics"]["total_users_analyzed"] += stats.get("users_analyzed", 0)
-                metrics["user_metrics"]["total_analysis_run"] += stats.get("analysis_run", 0)
-                metrics["user_metrics"]["total_runtime_seconds"] += session["duration_seconds"]
-                
-                break
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT start_time FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row:
+                duration = (end_dt - datetime.fromisoformat(row[0])).total_seconds()
+                self._db.execute(
+                    """UPDATE sessions SET end_time = ?, duration_seconds = ?,
+                       messages_processed = ?, users_analyzed = ?, analysis_run = ?, stats = ?
+                       WHERE session_id = ?""",
+                    (end_dt.isoformat(), duration,
+                     stats.get("messages_processed", 0), stats.get("users_analyzed", 0),
+                     stats.get("analysis_run", 0), _json_dumps(stats).decode(), session_id)
+                )
+            self._db.execute("DELETE FROM install_meta WHERE key = 'current_session'")
         
-        metrics.pop("current_session", None)
-        self._save_metrics(metrics)
+        self._save_metrics()
     
     def _get_system_info(self) -> Dict:
         """Get comprehensive system information"""
-        return {
-            "os": platform.system(),
-            "os_version": platform.version(),
-            "architecture": platform.architecture(),
-            "processor": platform.processor(),
-            "hostname": platform.node(),
-            "username": os.getenv('USER') or os.getenv('USERNAME'),
-            "wsl": "microsoft" in platform.release().lower(),
-            "termux": "com.termux" in os.environ.get('PREFIX', '')
-        }
+        return dict(_system_info())
     
     def _get_disk_space(self) -> Dict:
         """Get disk space information"""
@@ -111,15 +190,68 @@ class InstallationTracker:
         except:
             return {"error": "Unable to get disk space"}
     
+    def _write_meta(self, values: Dict):
+        """Upsert installation-level key/value metadata"""
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO install_meta (key, value) VALUES (?, ?)",
+                [(key, _json_dumps(value).decode()) for key, value in values.items()
+                 if key not in ("sessions", "user_metrics")]
+            )
+    
     def _load_metrics(self) -> Dict:
-        """Load installation metrics"""
-        try:
-            with open(self.metrics_file, 'r') as f:
-                return json.load(f)
-        except:
-            return {}
+        """Assemble installation metrics; global counters are aggregated in SQL"""
+        with self._db_lock:
+            metrics = {key: _json_loads(value) for key, value in self._db.execute("SELECT key, value FROM install_meta")}
+            
+            sessions = []
+            for row in self._db.execute(
+                """SELECT session_id, start_time, end_time, duration_seconds,
+                          messages_processed, users_analyzed, analysis_run, stats
+                   FROM sessions ORDER BY rowid"""
+            ):
+                session = _json_loads(row[7]) if row[7] else {}
+                session.update({
+                    "session_id": row[0],
+                    "start_time": row[1],
+                    "end_time": row[2],
+                    "duration_seconds": row[3],
+                    "messages_processed": row[4],
+                    "users_analyzed": row[5]
+                })
+                sessions.append(session)
+            
+            totals = self._db.execute(
+                """SELECT COALESCE(SUM(messages_processed), 0), COALESCE(SUM(users_analyzed), 0),
+                          COALESCE(SUM(analysis_run), 0), COALESCE(SUM(duration_seconds), 0)
+                   FROM sessions WHERE end_time IS NOT NULL"""
+            ).fetchone()
+        
+        metrics["sessions"] = sessions
+        metrics["user_metrics"] = {
+            "total_messages_processed": totals[0],
+            "total_users_analyzed": totals[1],
+            "total_analysis_run": totals[2],
+            "total_runtime_seconds": totals[3]
+        }
+        return metrics
+    
+    def _save_metrics(self):
+        """Schedule a JSON export shortly after the last update"""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self._flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
     
-    def _save_metrics(self, metrics: Dict):
-        """Save installation metrics"""
-        with open(self.metrics_file, 'w') as f:
-            json.dump(metrics, f, indent=2)
+    def _flush(self):
+        """Write the pending JSON export to disk"""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self.metrics_file.write_bytes(_json_dumps(self._load_metrics(), indent=True))
+            self._dirty = False
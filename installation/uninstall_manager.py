@@ -3,9 +3,14 @@ import os
 import json
 import shutil
 import subprocess
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 
+INSTALLATION_FILE_SUFFIXES = frozenset({'.py', '.json', '.db', '.log', '.txt', '.toml'})
+BYTECODE_SUFFIXES = frozenset({'.pyc', '.pyo'})
+
 class UninstallManager:
     def __init__(self, base_path: str):
         self.base_path = Path(base_path)
@@ -29,18 +34,16 @@ class UninstallManager:
     
     def _calculate_installation_duration(self, metrics: Dict) -> str:
         """Calculate total installation duration"""
-        install_date = metrics.get("installation_date")
-        if not install_date:
-            return "Unknown"
+        install_epoch = metrics.get("installation_epoch")
         
         try:
-            install_dt = datetime.fromisoformat(install_date)
-            uninstall_dt = datetime.now()
-            duration = uninstall_dt - install_dt
+            if install_epoch is None:
+                # Installs recorded before the epoch field only have the ISO string
+                install_epoch = datetime.fromisoformat(metrics["installation_date"]).timestamp()
             
-            days = duration.days
-            hours = duration.seconds // 3600
-            minutes = (duration.seconds % 3600) // 60
+            minutes, _ = divmod(int(time.time() - install_epoch), 60)
+            hours, minutes = divmod(minutes, 60)
+            days, hours = divmod(hours, 24)
             
             return f"{days} days, {hours} hours, {minutes} minutes"
         except:
@@ -48,15 +51,11 @@ class UninstallManager:
     
     def _scan_installation_files(self) -> List[str]:
         """Scan and list all installation files"""
-        file_list = []
-        
-        for root, dirs, files in os.walk(self.base_path):
-            for file in files:
-                if file.endswith(('.py', '.json', '.db', '.log', '.txt', '.toml')):
-                    rel_path = os.path.relpath(os.path.join(root, file), self.base_path)
-                    file_list.append(rel_path)
-        
-        return file_list
+        return [
+            str(path.relative_to(self.base_path))
+            for path in self.base_path.rglob('*')
+            if path.suffix in INSTALLATION_FILE_SUFFIXES and path.is_file()
+        ]
     
     def execute_uninstall(self, backup: bool = True) -> bool:
         """Execute the uninstallation process"""
@@ -82,20 +81,33 @@ class UninstallManager:
         backup_dir = self.base_path.parent / f"telegram_osint_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         backup_dir.mkdir(exist_ok=True)
         
-        # Backup database
-        db_file = self.base_path / "telegram_osint.db"
-        if db_file.exists():
-            shutil.copy2(db_file, backup_dir / "telegram_osint.db")
-        
-        # Backup config
-        config_dir = self.base_path / "config"
-        if config_dir.exists():
-            shutil.copytree(config_dir, backup_dir / "config", dirs_exist_ok=True)
-        
-        # Backup logs
-        logs_dir = self.base_path / "logs"
-        if logs_dir.exists():
-            shutil.copytree(logs_dir, backup_dir / "logs", dirs_exist_ok=True)
+        # The three copies are independent and IO-bound, so run them side by side
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = []
+            
+            # Backup database
+            db_file = self.base_path / "telegram_osint.db"
+            if db_file.exists():
+                futures.append(executor.submit(shutil.copy2, db_file, backup_dir / "telegram_osint.db"))
+            
+            # Backup config
+            config_dir = self.base_path / "config"
+            if config_dir.exists():
+                futures.append(executor.submit(
+                    shutil.copytree, config_dir, backup_dir / "config", dirs_exist_ok=True
+                ))
+            
+            # Backup logs (contents only; timestamps/permissions aren't needed)
+            logs_dir = self.base_path / "logs"
+            if logs_dir.exists():
+                futures.append(executor.submit(
+                    shutil.copytree, logs_dir, backup_dir / "logs",
+                    dirs_exist_ok=True, copy_function=shutil.copy
+                ))
+            
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()  # re-raise the first copy failure
         
         return backup_dir
     
@@ -123,10 +135,32 @@ class UninstallManager:
             if file_path.exists():
                 file_path.unlink()
         
-        # Remove Python cache files
-        for pycache in self.base_path.rglob("__pycache__"):
-            shutil.rmtree(pycache)
-        for pyc_file in self.base_path.rglob("*.pyc"):
-            pyc_file.unlink()
-        for pyo_file in self.base_path.rglob("*.pyo"):
-            pyo_file.unlink()
+        # Remove Python cache files left outside the removed trees
+        self._sweep_bytecode()
+    
+    def _sweep_bytecode(self):
+        """
+        Delete __pycache__ dirs and loose .pyc/.pyo files in one pruned walk
+        Cache dirs are removed as found and never descended into; hidden dirs
+        (.git and the like) are skipped. On POSIX every unlink/rmtree is issued
+        relative to the open directory fd, so no path is re-resolved per file
+        """
+        if os.unlink in os.supports_dir_fd:
+            for root, dirs, files, root_fd in os.fwalk(self.base_path):
+                if "__pycache__" in dirs:
+                    shutil.rmtree("__pycache__", dir_fd=root_fd, ignore_errors=True)
+                dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith('.')]
+                
+                for file_name in files:
+                    if os.path.splitext(file_name)[1] in BYTECODE_SUFFIXES:
+                        os.unlink(file_name, dir_fd=root_fd)
+            return
+        
+        for root, dirs, files in os.walk(self.base_path):
+            if "__pycache__" in dirs:
+                shutil.rmtree(os.path.join(root, "__pycache__"), ignore_errors=True)
+            dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith('.')]
+            
+            for file_name in files:
+                if os.path.splitext(file_name)[1] in BYTECODE_SUFFIXES:
+                    os.unlink(os.path.join(root, file_name))
@@ -0,0 +1,32 @@
+# tests/helpers.py
+"""
+Source files in this tree are fragments: names they share with the rest of
+the platform (logger, typing aliases, sibling classes) are resolved by the
+application at assembly time. load_fragment executes one file with those
+names supplied by the test.
+"""
+import logging
+import types
+import typing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMON_NAMES = {
+    'logger': logging.getLogger('zillagram.tests'),
+    'Any': typing.Any,
+    'Dict': typing.Dict,
+    'List': typing.List,
+    'Optional': typing.Optional,
+    'Tuple': typing.Tuple,
+}
+
+def load_fragment(relpath: str, **names) -> types.ModuleType:
+    """Execute a repo source file in a fresh module namespace"""
+    path = ROOT / relpath
+    module = types.ModuleType(relpath[:-3].replace('/', '.'))
+    module.__file__ = str(path)
+    module.__dict__.update(COMMON_NAMES)
+    module.__dict__.update(names)
+    exec(compile(path.read_text(), str(path), 'exec'), module.__dict__)
+    return module
@@ -0,0 +1,125 @@
+# tests/test_access_control.py
+import asyncio
+from types import SimpleNamespace
+
+from helpers import load_fragment
+
+class _Stub:
+    def __init__(self, *args, **kwargs):
+        pass
+
+class _Sessions:
+    def __init__(self):
+        self.ended = []
+    
+    async def validate_session(self, session_token):
+        return SimpleNamespace(user_id="alice", context={})
+    
+    async def end_session(self, session_token):
+        self.ended.append(session_token)
+
+class _Policies:
+    async def evaluate_access_policies(self, user_id, resource, action, context):
+        return True
+
+class _BrokenRedis:
+    async def smembers(self, key):
+        raise ConnectionError("redis down")
+
+def _access_control(**config):
+    module = load_fragment(
+        'core/security/access_control.py',
+        PolicyDecisionPoint=_Policies, SecureSessionManager=_Sessions, MultiFactorAuthEngine=_Stub
+    )
+    
+    class AccessControl(module.EnterpriseAccessControl):
+        user_roles = {"alice": ["analyst"]}
+        
+        async def _get_user_roles(self, user_id):
+            return [self.role_registry[role_id] for role_id in self.user_roles[user_id]]
+        
+        async def _store_user_roles(self, user_id, role_ids):
+            self.user_roles = {**self.user_roles, user_id: role_ids}
+        
+        async def _check_temporal_constraints(self, session, roles):
+            return True
+    
+    return module, AccessControl(config)
+
+def test_role_assignment_invalidates_cached_decision():
+    module, control = _access_control()
+    
+    async def scenario():
+        decisions = [await control.authorize_access("tok", "telegram_data", module.PermissionLevel.DELETE)]
+        await control.assign_user_roles("alice", ["supervisor"])
+        decisions.append(await control.authorize_access("tok", "telegram_data", module.PermissionLevel.DELETE))
+        return decisions
+    
+    assert asyncio.run(scenario()) == [False, True]
+
+def test_role_permission_change_invalidates_every_decision():
+    module, control = _access_control()
+    
+    async def scenario():
+        decisions = [await control.authorize_access("tok", "telegram_data", module.PermissionLevel.EDIT)]
+        await control.update_role_permissions("analyst", module.PermissionLevel.VIEW)
+        decisions.append(await control.authorize_access("tok", "telegram_data", module.PermissionLevel.EDIT))
+        return decisions
+    
+    assert asyncio.run(scenario()) == [True, False]
+
+def test_session_termination_drops_cached_decisions():
+    module, control = _access_control()
+    
+    async def scenario():
+        await control.authorize_access("tok", "telegram_data", module.PermissionLevel.VIEW)
+        await control.terminate_session("tok", "alice")
+    
+    asyncio.run(scenario())
+    assert control.session_manager.ended == ["tok"]
+    assert len(control._auth_cache) == 0
+
+def test_invalidate_survives_redis_outage():
+    module, control = _access_control()
+    control._redis = _BrokenRedis()
+    control._auth_cache[b"k"] = ("alice", True)
+    
+    asyncio.run(control.invalidate("alice"))
+    assert len(control._auth_cache) == 0
+
+def test_legacy_permission_strings_round_trip():
+    module, control = _access_control()
+    PermissionLevel = module.PermissionLevel
+    
+    assert PermissionLevel.from_legacy("view") is PermissionLevel.VIEW
+    assert PermissionLevel.from_legacy(["view", "super_user"]) == PermissionLevel.VIEW | PermissionLevel.SUPER_USER
+    assert (PermissionLevel.EDIT | PermissionLevel.DELETE).to_legacy() == ["edit", "delete"]
+    
+    supervisor = control.role_registry["supervisor"]
+    assert module.Role.from_dict(supervisor.to_dict()).permissions_mask == supervisor.permissions_mask
+
+def test_configured_roles_use_legacy_permission_values():
+    module, control = _access_control(roles=[{
+        'role_id': 'reviewer', 'name': 'Reviewer',
+        'permissions': ['view', 'edit'], 'data_scopes': ['analysis_results'],
+        'inheritance': ['auditor']
+    }])
+    
+    reviewer = control.role_registry['reviewer']
+    assert reviewer.permissions_mask == module.PermissionLevel.VIEW | module.PermissionLevel.EDIT
+    assert reviewer.effective_mask == reviewer.permissions_mask
+    
+    asyncio.run(control.update_role_permissions('reviewer', ['view']))
+    assert reviewer.permissions_mask == module.PermissionLevel.VIEW
+
+def test_string_actions_are_normalized_or_denied():
+    module, control = _access_control()
+    
+    async def scenario():
+        return (
+            await control.authorize_access("tok", "telegram_data", "edit"),
+            await control.authorize_access("tok", "telegram_data", "delete"),
+            await control.authorize_access("tok", "telegram_data", "analyze")
+        )
+    
+    assert asyncio.run(scenario()) == (True, False, False)
@@ -0,0 +1,208 @@
+# tests/test_api_gateway.py
+import asyncio
+import threading
+import time
+
+from fastapi import Request
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+
+from helpers import load_fragment
+
+class _Stub:
+    def __init__(self, *args, **kwargs):
+        pass
+
+def _load_app():
+    rate_limiting = load_fragment(
+        'core/security/rate_limiting.py',
+        asyncio=asyncio, time=time,
+        ClientBehaviorAnalyzer=_Stub, RateLimitAnomalyDetector=_Stub, APISecurityContext=object
+    )
+    gateway_module = load_fragment(
+        'core/security/api_gateway.py',
+        AdaptiveRateLimiter=rate_limiting.AdaptiveRateLimiter,
+        APIThreatDetector=_Stub, APIRequestValidator=_Stub, APIAuthProvider=_Stub
+    )
+    
+    class Gateway(gateway_module.EnterpriseAPISecurityGateway):
+        """Real admission/ticket handling with the security checks passing"""
+        async def _detect_threats(self, request, context):
+            return {"allowed": True}
+        
+        async def _validate_request(self, request, context):
+            return {"allowed": True}
+        
+        async def _enforce_policies(self, request, context):
+            return {"allowed": True}
+        
+        def __init__(self, config):
+            super().__init__(config)
+            self._auth_stage = []
+            self._parallel_stage = []
+            self._final_stage = []
+        
+        async def _create_security_context(self, request):
+            return None
+        
+        async def _log_approved_request(self, request, context):
+            pass
+        
+        async def _determine_processing_tier(self, context):
+            return "standard"
+    
+    security = load_fragment(
+        'core/enterprise_security.py',
+        Request=Request, HTTPAuthorizationCredentials=HTTPAuthorizationCredentials,
+        EnterpriseComplianceEngine=_Stub, EnterpriseAccessControl=_Stub,
+        EnterpriseEncryptionEngine=_Stub, EnterpriseAPISecurityGateway=Gateway,
+        load_config=lambda: {}
+    )
+    return security
+
+def test_approved_requests_release_admission_tickets():
+    security = _load_app()
+    limiter = security.enterprise_security.api_gateway.rate_limiter.concurrency_limiter
+    
+    @security.app.get("/ping")
+    async def ping():
+        return {"ok": True}
+    
+    client = TestClient(security.app)
+    for _ in range(int(limiter.limit) * 3):
+        assert client.get("/ping").status_code == 200
+    
+    assert limiter.inflight == 0
+
+def test_failed_backend_releases_admission_ticket():
+    security = _load_app()
+    limiter = security.enterprise_security.api_gateway.rate_limiter.concurrency_limiter
+    
+    @security.app.get("/boom")
+    async def boom():
+        raise RuntimeError("backend failure")
+    
+    client = TestClient(security.app, raise_server_exceptions=False)
+    for _ in range(int(limiter.limit) + 5):
+        assert client.get("/boom").status_code == 500
+    
+    assert limiter.inflight == 0
+
+class _AuthResult:
+    def __init__(self, authenticated, user_id="alice"):
+        self.authenticated = authenticated
+        self.user_id = user_id
+        self.permissions = ["read"]
+        self.strength = 0.9
+
+class _AsyncAuthProvider:
+    """Provider with async I/O entry points and a synchronous signature check"""
+    def __init__(self, config):
+        self.allow = config.get("allow", True)
+        self.verify_threads = []
+        self.io_threads = []
+    
+    def verify_credentials(self, credentials):
+        self.verify_threads.append(threading.get_ident())
+        return {"token": credentials, "valid": credentials == "good-token"}
+    
+    async def authenticate(self, claims):
+        self.io_threads.append(threading.get_ident())
+        return _AuthResult(claims["valid"])
+    
+    async def authorize(self, user_id, endpoint, method):
+        self.io_threads.append(threading.get_ident())
+        return self.allow
+
+def _load_auth_gateway(provider_cls):
+    gateway_module = load_fragment(
+        'core/security/api_gateway.py',
+        AdaptiveRateLimiter=_Stub, APIThreatDetector=_Stub,
+        APIRequestValidator=_Stub, APIAuthProvider=provider_cls
+    )
+    
+    class Gateway(gateway_module.EnterpriseAPISecurityGateway):
+        _detect_threats = _validate_request = _enforce_policies = None
+        
+        async def _extract_credentials(self, request):
+            return request.headers.get("authorization")
+    
+    return gateway_module, Gateway
+
+def _run_auth(provider_cls, config, token):
+    from types import SimpleNamespace
+    gateway_module, Gateway = _load_auth_gateway(provider_cls)
+    gateway = Gateway(config)
+    request = SimpleNamespace(
+        headers={"authorization": token},
+        url=SimpleNamespace(path="/data"), method="GET"
+    )
+    context = gateway_module.APISecurityContext("c", "", [], "standard", 0.0, 0.0)
+    result = asyncio.run(gateway._validate_authentication(request, context))
+    return gateway, context, result, threading.get_ident()
+
+def test_only_signature_verification_leaves_the_event_loop():
+    gateway, context, result, loop_thread = _run_auth(_AsyncAuthProvider, {}, "good-token")
+    
+    assert result == {"allowed": True}
+    assert context.user_id == "alice"
+    assert gateway.auth_provider.verify_threads and loop_thread not in gateway.auth_provider.verify_threads
+    assert gateway.auth_provider.io_threads == [loop_thread, loop_thread]
+
+def test_authentication_and_authorization_failures_are_denied():
+    _, _, result, _ = _run_auth(_AsyncAuthProvider, {}, "bad-token")
+    assert result["reason"] == "authentication_failed"
+    
+    _, _, result, _ = _run_auth(_AsyncAuthProvider, {"allow": False}, "good-token")
+    assert result["reason"] == "authorization_failed"
+
+def test_provider_without_sync_verifier_is_awaited_directly():
+    class PlainProvider(_AsyncAuthProvider):
+        verify_credentials = None
+        
+        async def authenticate(self, credentials):
+            return _AuthResult(credentials == "good-token")
+    
+    _, context, result, _ = _run_auth(PlainProvider, {}, "good-token")
+    assert result == {"allowed": True}
+    assert context.user_id == "alice"
+
+def _gateway_with(**overrides):
+    security = _load_app()
+    gateway = security.enterprise_security.api_gateway
+    for name, method in overrides.items():
+        setattr(gateway, name, method)
+    return gateway, gateway.rate_limiter.concurrency_limiter
+
+def test_post_check_failure_releases_admission_ticket():
+    async def broken_tier(context):
+        raise RuntimeError("tier lookup failed")
+    
+    gateway, limiter = _gateway_with(_determine_processing_tier=broken_tier)
+    
+    async def scenario():
+        for _ in range(int(limiter.limit) + 5):
+            try:
+                await gateway.process_api_request(None)
+            except RuntimeError:
+                pass
+    
+    asyncio.run(scenario())
+    assert limiter.inflight == 0
+
+def test_cancelled_request_releases_admission_ticket():
+    async def hanging_check(request, context):
+        await asyncio.Event().wait()
+    
+    gateway, limiter = _gateway_with()
+    gateway._auth_stage = [hanging_check]
+    
+    async def scenario():
+        task = asyncio.create_task(gateway.process_api_request(None))
+        await asyncio.sleep(0.01)
+        assert limiter.inflight == 1
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    
+    asyncio.run(scenario())
+    assert limiter.inflight == 0
@@ -0,0 +1,71 @@
+# tests/test_api_threat_detection.py
+import asyncio
+
+import numpy as np
+
+from helpers import load_fragment
+
+def _batcher_cls():
+    return load_fragment(
+        'core/security/api_threat_detection.py', np=np, Request=object, APISecurityContext=object
+    ).BehavioralBatcher
+
+_NUMERIC = {
+    "request_frequency": 3,
+    "endpoint_access_pattern": 0.5,
+    "parameter_usage": 1.0,
+    "temporal_pattern": 0.0,
+    "geographic_consistency": True
+}
+
+class _PerItemAnalyzer:
+    async def detect_anomalies(self, features):
+        return 0.25
+
+class _BatchAnalyzer(_PerItemAnalyzer):
+    def __init__(self):
+        self.batch_sizes = []
+    
+    async def detect_anomalies_batch(self, features):
+        self.batch_sizes.append(len(features))
+        return features.sum(axis=1) / 10
+
+def test_analyzer_without_batch_api_is_scored_per_item():
+    batcher = _batcher_cls()(_PerItemAnalyzer())
+    assert asyncio.run(batcher.score(_NUMERIC)) == 0.25
+
+def test_numeric_features_are_scored_in_one_batch():
+    analyzer = _BatchAnalyzer()
+    batcher = _batcher_cls()(analyzer)
+    
+    async def scenario():
+        return await asyncio.gather(*(batcher.score(_NUMERIC) for _ in range(8)))
+    
+    scores = asyncio.run(scenario())
+    assert np.allclose(scores, 0.55)
+    assert analyzer.batch_sizes == [8]
+
+def test_non_numeric_features_fall_back_to_per_item_scoring():
+    analyzer = _BatchAnalyzer()
+    batcher = _batcher_cls()(analyzer)
+    features = dict(_NUMERIC, endpoint_access_pattern={"/admin": 4})
+    
+    assert asyncio.run(batcher.score(features)) == 0.25
+    assert analyzer.batch_sizes == []
+
+class _ShortBatchAnalyzer(_BatchAnalyzer):
+    async def detect_anomalies_batch(self, features):
+        self.batch_sizes.append(len(features))
+        return (features.sum(axis=1) / 10)[:-1]
+
+def test_short_batch_result_falls_back_to_per_item_scoring():
+    analyzer = _ShortBatchAnalyzer()
+    batcher = _batcher_cls()(analyzer)
+    
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.score(_NUMERIC) for _ in range(4))), timeout=1
+        )
+    
+    assert asyncio.run(scenario()) == [0.25] * 4
+    assert analyzer.batch_sizes == [4]
@@ -0,0 +1,61 @@
+# tests/test_debug_engine.py
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from helpers import load_fragment
+
+class _Stub:
+    pass
+
+def _engine():
+    module = load_fragment(
+        'utils/debug_engine.py',
+        PerformanceMonitor=_Stub, ErrorTracker=_Stub,
+        Color=SimpleNamespace(GREEN="", RED="", END="")
+    )
+    
+    class Engine(module.DebugEngine):
+        probe_threads = []
+        
+        def _check_database(self):
+            self.probe_threads.append(threading.get_ident())
+            return True
+        
+        def _check_agents(self):
+            return 1
+        
+        def _check_models(self):
+            raise RuntimeError("model store unreachable")
+        
+        def _check_security(self):
+            return True
+        
+        def _check_network(self):
+            return False
+    
+    return Engine()
+
+_EXPECTED = {
+    "Database Connection": True,
+    "AI Agents Status": True,
+    "ML Models Loaded": False,
+    "Security Systems": True,
+    "Network Connectivity": False
+}
+
+def test_blocking_probes_run_off_the_loop_and_fail_individually():
+    engine = _engine()
+    assert asyncio.run(engine._gather_health_checks()) == _EXPECTED
+    assert threading.get_ident() not in engine.probe_threads
+
+def test_health_check_works_inside_a_running_loop(capsys):
+    engine = _engine()
+    
+    async def from_loop():
+        engine._run_health_check()
+    
+    asyncio.run(from_loop())
+    output = capsys.readouterr().out
+    assert "Database Connection: PASS" in output
+    assert "ML Models Loaded: FAIL" in output
@@ -0,0 +1,55 @@
+# tests/test_mfa_engine.py
+import asyncio
+import logging
+
+from helpers import load_fragment
+
+class _Validator:
+    def __init__(self, outcome=True):
+        self.outcome = outcome
+    
+    async def validate(self, user_id, factor_data):
+        if isinstance(self.outcome, BaseException):
+            raise self.outcome
+        return self.outcome
+
+class _RiskAssessor:
+    async def assess_authentication_risk(self, user_id, auth_attempt):
+        return "medium"
+
+def _mfa_engine(possession):
+    module = load_fragment(
+        'core/security/mfa_engine.py',
+        KnowledgeFactorValidator=_Validator,
+        PossessionFactorValidator=lambda: _Validator(possession),
+        InherenceFactorValidator=_Validator,
+        LocationFactorValidator=_Validator,
+        BehavioralFactorValidator=_Validator,
+        AuthenticationRiskAssessor=_RiskAssessor
+    )
+    
+    class MFAEngine(module.MultiFactorAuthEngine):
+        def _calculate_auth_strength(self, factor_results):
+            return sum(factor_results.values())
+        
+        def _get_session_restrictions(self, risk_level, auth_strength):
+            return {}
+    
+    return MFAEngine({})
+
+def test_failing_validator_is_logged_and_denies(caplog):
+    engine = _mfa_engine(RuntimeError("totp backend down"))
+    
+    with caplog.at_level(logging.ERROR, logger='zillagram.tests'):
+        result = asyncio.run(engine.authenticate_with_mfa("user", {}))
+    
+    assert result["authenticated"] is False
+    assert result["factor_results"] == {"knowledge": True, "possession": False}
+    assert "possession" in caplog.text and "totp backend down" in caplog.text
+
+def test_cancelled_validator_counts_as_failed():
+    engine = _mfa_engine(asyncio.CancelledError())
+    
+    result = asyncio.run(engine.authenticate_with_mfa("user", {}))
+    assert result["authenticated"] is False
+    assert result["factor_results"]["possession"] is False
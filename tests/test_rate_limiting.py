@@ -0,0 +1,82 @@
+# tests/test_rate_limiting.py
+import asyncio
+import time
+from types import SimpleNamespace
+
+from helpers import load_fragment
+
+class _Stub:
+    def __init__(self, *args, **kwargs):
+        pass
+
+_RATE_LIMITS = {
+    'tiers': {
+        'basic': {'second': 5, 'minute': 100, 'hour': 1000, 'day': 10000},
+        'premium': {'second': 50, 'minute': 1000, 'hour': 10000, 'day': 100000}
+    },
+    'endpoint_scale': {'/auth': 0.2}
+}
+
+def _limiter(**config):
+    config.setdefault('rate_limits', _RATE_LIMITS)
+    module = load_fragment(
+        'core/security/rate_limiting.py',
+        asyncio=asyncio, time=time,
+        ClientBehaviorAnalyzer=_Stub, RateLimitAnomalyDetector=_Stub, APISecurityContext=object
+    )
+    
+    class Limiter(module.AdaptiveRateLimiter):
+        async def _calculate_adaptive_limits(self, client_id, base_limits, context):
+            return dict(base_limits)
+        
+        async def _check_windows_locked(self, client_id, endpoint, bucket_key, adaptive_limits):
+            return None
+        
+        async def _analyze_client_behavior(self, client_id, endpoint, context):
+            pass
+        
+        async def _get_current_usage(self, client_id, endpoint):
+            return {}
+    
+    return Limiter(config)
+
+_BASIC = SimpleNamespace(rate_limit_tier="basic")
+
+def test_denial_reports_the_bucket_level():
+    limiter = _limiter()
+    
+    async def scenario():
+        results = [await limiter.check_rate_limit("c1", "/data", _BASIC) for _ in range(6)]
+        await asyncio.sleep(0)
+        return results
+    
+    results = asyncio.run(scenario())
+    assert all(result["allowed"] for result in results[:5])
+    denied = results[5]
+    assert denied["allowed"] is False
+    assert 0 <= denied["tokens"] < 1
+    assert denied["current"] == denied["limit"] - denied["tokens"]
+
+def test_bucket_map_is_bounded_and_keeps_busy_buckets():
+    limiter = _limiter(rate_limit_max_buckets=3)
+    
+    async def scenario():
+        for _ in range(5):
+            await limiter.check_rate_limit("busy", "/data", _BASIC)
+        for client in range(10):
+            await limiter.check_rate_limit(f"client-{client}", "/data", _BASIC)
+            await limiter.check_rate_limit("busy", "/data", _BASIC)
+        await asyncio.sleep(0)
+    
+    asyncio.run(scenario())
+    assert len(limiter._buckets) <= 3
+    assert ("busy", "/data") in limiter._buckets
+
+def test_base_limits_come_from_config_and_are_memoized():
+    limiter = _limiter()
+    
+    premium = limiter._get_base_limits("premium", "/data")
+    assert dict(premium) == _RATE_LIMITS['tiers']['premium']
+    assert limiter._get_base_limits("premium", "/data") is premium
+    assert limiter._get_base_limits("premium", "/auth/login")["second"] == 10
+    assert dict(limiter._get_base_limits("unknown", "/data")) == _RATE_LIMITS['tiers']['basic']
@@ -0,0 +1,59 @@
+# tests/test_secure_data_manager.py
+import sys
+
+import pytest
+
+from helpers import load_fragment
+
+def test_stdlib_fallback_matches_orjson_output(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+    module = load_fragment(
+        'core/security/secure_data_manager.py',
+        EnterpriseEncryptionEngine=object, SensitivityLevel=object, EncryptionResult=object
+    )
+    
+    payload = {"b": [1, 2.5, None], "a": "café ✓", 3: True}
+    assert module._json_dumps(payload, sort_keys=False) == (
+        '{"b":[1,2.5,null],"a":"café ✓","3":true}'.encode('utf-8')
+    )
+    assert module._json_dumps({"z": 1, "a": {"y": 2, "x": 3}}, sort_keys=True) == b'{"a":{"x":3,"y":2},"z":1}'
+    assert module._json_loads(module._json_dumps(payload)) == {"b": [1, 2.5, None], "a": "café ✓", "3": True}
+
+_RULES = {
+    'communication_content': ['message', 'chat'],
+    'intelligence_data': ['actor', 'campaign'],
+    'operational_secrets': ['operation', 'api_key']
+}
+
+def _classifier(monkeypatch, with_automaton: bool):
+    if not with_automaton:
+        monkeypatch.setitem(sys.modules, 'ahocorasick', None)
+    module = load_fragment(
+        'core/security/secure_data_manager.py',
+        EnterpriseEncryptionEngine=object, SensitivityLevel=object, EncryptionResult=object
+    )
+    
+    class Classifier(module.DataSensitivityClassifier):
+        def _load_classification_rules(self):
+            return _RULES
+    
+    return module, Classifier()
+
+@pytest.mark.parametrize("with_automaton", [False, True])
+def test_indicators_match_whole_tokens_only(monkeypatch, with_automaton):
+    if with_automaton:
+        pytest.importorskip('ahocorasick')
+    module, classifier = _classifier(monkeypatch, with_automaton)
+    
+    data = {"note": "two-factor cooperation with a chatbot vendor", "sender_email": "x"}
+    assert classifier._scan_indicators(data, "") == module.INDICATOR_PII
+
+@pytest.mark.parametrize("with_automaton", [False, True])
+def test_indicators_come_from_classification_rules(monkeypatch, with_automaton):
+    if with_automaton:
+        pytest.importorskip('ahocorasick')
+    module, classifier = _classifier(monkeypatch, with_automaton)
+    
+    data = {"text": "threat actor leaked an api_key", "chat": {"message": "ok"}}
+    expected = module.INDICATOR_COMMUNICATION | module.INDICATOR_INTELLIGENCE | module.INDICATOR_OPERATIONAL
+    assert classifier._scan_indicators(data, "campaign review") == expected
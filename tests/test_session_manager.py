@@ -0,0 +1,157 @@
+# tests/test_session_manager.py
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from helpers import load_fragment
+
+class _Session(SimpleNamespace):
+    pass
+
+class _Store:
+    def __init__(self):
+        self.sessions = {}
+    
+    async def store_session(self, session):
+        self.sessions[session.session_id] = session
+    
+    async def retrieve_session(self, session_id):
+        return self.sessions.get(session_id)
+    
+    async def update_session(self, session):
+        if session.session_id in self.sessions:
+            self.sessions[session.session_id] = session
+
+class _Detector:
+    def __init__(self):
+        self.threat = False
+    
+    async def analyze_session_activity(self, session):
+        return self.threat
+
+class _FastAsyncio:
+    """asyncio with the wheel's one-second tick shortened for tests"""
+    def __getattr__(self, name):
+        return getattr(asyncio, name)
+    
+    @staticmethod
+    def sleep(delay, result=None):
+        return asyncio.sleep(delay / 100, result)
+
+def _manager(**config):
+    module = load_fragment(
+        'core/security/session_manager.py',
+        asyncio=_FastAsyncio(), datetime=datetime, timedelta=timedelta, Session=_Session,
+        EncryptedSessionStore=_Store, SessionThreatDetector=_Detector
+    )
+    
+    class Manager(module.SecureSessionManager):
+        def __init__(self, config):
+            super().__init__(config)
+            self.terminated = []
+            self.reauthenticated = []
+        
+        def _generate_secure_session_id(self):
+            return f"s{len(self.session_store.sessions)}"
+        
+        def _calculate_reauth_frequency(self, auth_result):
+            return 3600
+        
+        def _schedule_monitoring(self, session, expires_mono):
+            pass
+        
+        async def _requires_reauthentication(self, session):
+            return False
+        
+        async def _alert_security_team(self, session, threat):
+            pass
+        
+        async def _terminate_session(self, session_id):
+            self.terminated.append(session_id)
+            self.session_store.sessions.pop(session_id, None)
+        
+        async def _force_reauthentication(self, session_id):
+            self.reauthenticated.append(session_id)
+    
+    return Manager(config)
+
+_AUTH = {'user_id': 'alice', 'assigned_roles': ['analyst']}
+
+def test_terminated_session_is_evicted_from_hot_set():
+    async def scenario():
+        manager = _manager()
+        session = await manager.create_secure_session(_AUTH)
+        assert await manager.validate_session(session.session_id) is session
+        
+        manager.threat_detector.threat = True
+        assert await manager.validate_session(session.session_id) is None
+        assert session.session_id not in manager._session_hot
+        
+        manager.threat_detector.threat = False
+        assert await manager.validate_session(session.session_id) is None
+        return manager, session
+    
+    manager, session = asyncio.run(scenario())
+    assert manager.terminated == [session.session_id]
+
+def test_forced_reauthentication_evicts_hot_entry():
+    async def scenario():
+        manager = _manager()
+        manager._detect_geographic_anomaly = lambda session: asyncio.sleep(0, True)
+        session = await manager.create_secure_session(_AUTH)
+        keep = await manager._monitor_session_security(session, time.monotonic() + 60)
+        return manager, session, keep
+    
+    manager, session, keep = asyncio.run(scenario())
+    assert keep is False
+    assert manager.reauthenticated == [session.session_id]
+    assert session.session_id not in manager._session_hot
+
+def test_stale_hot_entry_rechecks_the_store():
+    async def scenario():
+        manager = _manager(session_hot_ttl=0.05)
+        session = await manager.create_secure_session(_AUTH)
+        
+        # Revoked by another process: only the store knows
+        manager.session_store.sessions.clear()
+        assert await manager.validate_session(session.session_id) is session
+        
+        await asyncio.sleep(0.1)
+        return await manager.validate_session(session.session_id)
+    
+    assert asyncio.run(scenario()) is None
+
+def test_slow_checks_do_not_stall_the_wheel():
+    async def scenario():
+        manager = _manager(monitor_concurrency=2)
+        release = asyncio.Event()
+        running = []
+        peak = []
+        
+        async def slow_check(session, expires_mono):
+            running.append(session)
+            peak.append(len(running))
+            await release.wait()
+            running.remove(session)
+            return True
+        
+        manager._monitor_session_security = slow_check
+        expires = time.monotonic() + 60
+        sessions = [SimpleNamespace(session_id=f"s{i}") for i in range(5)]
+        manager._monitor_wheel[1] = [(session, expires) for session in sessions]
+        
+        loop_task = asyncio.create_task(manager._monitor_loop())
+        await asyncio.sleep(0.1)
+        cursor_while_blocked = manager._wheel_cursor
+        release.set()
+        await asyncio.sleep(0.05)
+        loop_task.cancel()
+        
+        rescheduled = sum(len(slot) for slot in manager._monitor_wheel)
+        return cursor_while_blocked, max(peak), rescheduled
+    
+    cursor, peak, rescheduled = asyncio.run(scenario())
+    assert cursor > 3
+    assert peak == 2
+    assert rescheduled == 5
@@ -0,0 +1,131 @@
+# tests/test_threat_engine.py
+import asyncio
+
+from helpers import load_fragment
+
+class _Stub:
+    def __init__(self, *args, **kwargs):
+        pass
+
+class _EmptyFeed(_Stub):
+    async def get_active_campaigns(self):
+        return []
+
+class _IOCManager:
+    def __init__(self, config):
+        self.feed = {
+            'ip_addresses': ['203.0.113.7'],
+            'domains': ['*.bad.example', 'c2.example'],
+            'hashes': ['D41D8CD98F00B204E9800998ECF8427E']
+        }
+    
+    async def refresh_feed(self):
+        return self.feed
+
+def _engine():
+    module = load_fragment(
+        'core/threat_intelligence/threat_engine.py',
+        IOCManager=_IOCManager, InternalThreatFeed=_EmptyFeed, CommercialIntelFeeds=_EmptyFeed,
+        OSINTIntelFeeds=_EmptyFeed, GovernmentIntelShares=_EmptyFeed
+    )
+    module.ThreatCorrelationEngine = _Stub
+    
+    class Engine(module.ThreatIntelligenceEngine):
+        async def _check_behavioral_indicators(self, behaviors):
+            return []
+        
+        def _calculate_ioc_confidence(self, matches):
+            return 1.0 if any(matches.values()) else 0.0
+    
+    return module, Engine({})
+
+def test_initialized_engine_matches_feed_indicators():
+    module, engine = _engine()
+    
+    async def scenario():
+        await engine.initialize_intel_sources()
+        try:
+            return await engine.check_ioc_matches({
+                'ip_addresses': ['203.0.113.7', '198.51.100.1'],
+                'domains': ['cdn.bad.example', 'bad.example', 'c2.example'],
+                'hashes': ['d41d8cd98f00b204e9800998ecf8427e']
+            })
+        finally:
+            engine._ioc_refresh_task.cancel()
+            engine._campaign_refresh_task.cancel()
+    
+    result = asyncio.run(scenario())
+    assert result['matches_found']
+    assert result['detailed_matches']['ip_addresses'] == ['203.0.113.7']
+    assert result['detailed_matches']['domains'] == ['cdn.bad.example', 'c2.example']
+    assert result['detailed_matches']['hashes'] == ['d41d8cd98f00b204e9800998ecf8427e']
+
+def test_feed_refresh_replaces_the_index():
+    module, engine = _engine()
+    
+    async def scenario():
+        await engine.refresh_ioc_feed()
+        engine.ioc_manager.feed = {'ip_addresses': ['192.0.2.1']}
+        await engine.refresh_ioc_feed()
+        return await engine.check_ioc_matches({'ip_addresses': ['203.0.113.7', '192.0.2.1']})
+    
+    result = asyncio.run(scenario())
+    assert result['detailed_matches']['ip_addresses'] == ['192.0.2.1']
+
+class _CampaignFeed:
+    polls = 0
+    
+    async def get_active_campaigns(self):
+        _CampaignFeed.polls += 1
+        return [
+            {
+                'name': 'Op Lantern', 'attribution': 'APT-X', 'confidence': 0.9,
+                'tactics': ['phishing', 'credential_harvest'],
+                'indicators': [{'type': 'ip', 'value': '203.0.113.7'}, 'c2.example']
+            },
+            {
+                'name': 'Op Quiet', 'attribution': 'APT-Y',
+                'tactics': ['wiper'], 'indicators': [['nested', 'indicator']]
+            }
+        ]
+
+def test_behavior_correlates_with_structured_campaign_indicators():
+    module, engine = _engine()
+    engine.intel_sources = {'internal': _CampaignFeed()}
+    
+    behavior = {
+        'behaviors': ['phishing', 'credential_harvest'],
+        'ip_addresses': ['203.0.113.7'],
+        'domains': ['c2.example']
+    }
+    correlated = asyncio.run(engine._correlate_with_campaigns(behavior))
+    
+    assert [campaign['campaign'] for campaign in correlated] == ['Op Lantern']
+    assert correlated[0]['similarity_score'] > 0.99
+
+def test_campaign_fingerprint_is_stable_across_refreshes():
+    module, engine = _engine()
+    engine.intel_sources = {'internal': _CampaignFeed()}
+    
+    asyncio.run(engine._get_active_campaigns())
+    fingerprint = engine._campaign_fingerprint
+    engine._correlation_cache[b'marker'] = []
+    asyncio.run(engine._get_active_campaigns())
+    
+    assert engine._campaign_fingerprint == fingerprint
+    assert b'marker' in engine._correlation_cache
+
+def test_cached_correlations_do_not_poll_feeds():
+    module, engine = _engine()
+    engine.intel_sources = {'internal': _CampaignFeed()}
+    behavior = {'behaviors': ['phishing'], 'ip_addresses': ['203.0.113.7']}
+    
+    async def scenario():
+        before = _CampaignFeed.polls
+        results = [await engine._correlate_with_campaigns(behavior) for _ in range(5)]
+        await engine._correlate_with_campaigns({'behaviors': ['wiper']})
+        return results, _CampaignFeed.polls - before
+    
+    results, polls = asyncio.run(scenario())
+    assert polls == 1
+    assert all(result == results[0] for result in results)
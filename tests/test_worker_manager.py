@@ -0,0 +1,116 @@
+# tests/test_worker_manager.py
+import asyncio
+import time
+
+import pytest
+
+from helpers import load_fragment
+
+def _module():
+    return load_fragment('core/workers/worker_manager.py', WorkerPerformanceMonitor=object)
+
+def test_sustained_load_keeps_bucket_state():
+    limiter = _module().ScrapingRateLimiter(rate=20.0, burst=2.0, max_targets=4)
+    
+    async def scenario():
+        start = time.monotonic()
+        granted = 0
+        while time.monotonic() - start < 0.75:
+            await limiter.wait_if_needed("hot-target")
+            await limiter.wait_if_needed(f"cold-{granted % 8}")
+            granted += 1
+        return granted, time.monotonic() - start
+    
+    granted, elapsed = asyncio.run(scenario())
+    
+    # A bucket reset would hand out a fresh burst on top of the refill rate
+    assert granted <= 2.0 + 20.0 * elapsed + 1
+    assert "hot-target" in limiter._buckets
+
+def test_only_refilled_buckets_are_evicted():
+    limiter = _module().ScrapingRateLimiter(rate=1000.0, burst=1.0)
+    
+    async def scenario():
+        await limiter.wait_if_needed("a")
+        await asyncio.sleep(0.01)
+        await limiter.wait_if_needed("b")
+    
+    asyncio.run(scenario())
+    assert list(limiter._buckets) == ["b"]
+    
+    slow = _module().ScrapingRateLimiter(rate=0.01, burst=1.0)
+    
+    async def drained():
+        await slow.wait_if_needed("a")
+        await slow.wait_if_needed("b")
+    
+    asyncio.run(drained())
+    assert list(slow._buckets) == ["a", "b"]
+
+class _EchoModel:
+    def predict(self, data):
+        return ("echo", data)
+
+def test_analysis_process_initializer_loads_registered_models():
+    module = _module()
+    module.register_analysis_model("echo", _EchoModel)
+    
+    module._init_analysis_process(dict(module._model_factories))
+    assert module._run_analysis("echo", 42) == ("echo", 42)
+
+def test_shutdown_releases_analysis_process_pool():
+    module = _module()
+    worker_cls = module.SpecializedWorkers.AnalysisWorker
+    pool = worker_cls._get_cpu_pool()
+    
+    manager = module.EnterpriseWorkerManager({})
+    asyncio.run(manager.shutdown())
+    
+    assert worker_cls._cpu_pool is None
+    with pytest.raises(RuntimeError):
+        pool.submit(print)
+
+def test_completed_tasks_keep_their_fields_for_holders():
+    module = _module()
+    seen = []
+    
+    class Worker:
+        def __init__(self, worker_id):
+            self.worker_id = worker_id
+        
+        async def assign_task(self, task):
+            seen.append(task)
+            if task.payload.get('fail'):
+                raise RuntimeError("boom")
+    
+    class Manager(module.EnterpriseWorkerManager):
+        _next_task = 0
+        
+        def _generate_task_id(self):
+            self._next_task += 1
+            return f"task-{self._next_task}"
+        
+        async def _create_worker(self, worker_index, task_type):
+            return Worker(worker_index)
+    
+    async def scenario():
+        manager = Manager({})
+        await manager.add_worker("analysis")
+        pool = manager.pools["analysis"]
+        distributor = asyncio.create_task(manager._distribute_tasks(pool))
+        for payload in ({'n': 1}, {'fail': True}, {'n': 3}):
+            await manager.submit_task("analysis", payload)
+        await asyncio.sleep(0.05)
+        distributor.cancel()
+        for worker_id in list(pool.workers):
+            manager.retire_worker("analysis", worker_id)
+        await asyncio.sleep(0)
+    
+    asyncio.run(scenario())
+    assert sorted(task.task_id for task in seen) == ["task-1", "task-2", "task-3"]
+    assert len({id(task) for task in seen}) == 3
+    assert {task.task_id: (task.status, task.payload) for task in seen} == {
+        "task-1": ("done", {'n': 1}),
+        "task-2": ("failed", {'fail': True}),
+        "task-3": ("done", {'n': 3})
+    }
@@ -1,4 +1,7 @@
 # utils/debug_engine.py
+import asyncio
+import concurrent.futures
+
 class DebugEngine:
     def __init__(self):
         self.log_level = "INFO"
@@ -29,16 +32,37 @@ class DebugEngine:
             # ... other options
     
     def _run_health_check(self):
-        """Comprehensive system healt            "ML Models Loaded": self._check_models(),
-h check"""
-        checks = {
-            "Database Connection": self._check_database(),
-            "AI Agents Status": self._check_agents(),
-            "Security Systems": self._check_security(),
-            "Network Connectivity": self._check_network()
-        }
+        """Comprehensive system health check"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            statuses = asyncio.run(self._gather_health_checks())
+        else:
+            # Called from inside a running loop: drive the probes on a private one
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                statuses = executor.submit(asyncio.run, self._gather_health_checks()).result()
         
-        for check_name, check_func in checks.items():
-            status = check_func()
+        for check_name, status in statuses.items():
             color = Color.GREEN if status else Color.RED
             print(f"{color}✓ {check_name}: {'PASS' if status else 'FAIL'}{Color.END}")
+    
+    async def _gather_health_checks(self) -> Dict[str, bool]:
+        """Run all health probes concurrently; a probe that raises counts as FAIL"""
+        checks = {
+            "Database Connection": self._check_database,
+            "AI Agents Status": self._check_agents,
+            "ML Models Loaded": self._check_models,
+            "Security Systems": self._check_security,
+            "Network Connectivity": self._check_network
+        }
+        
+        results = await asyncio.gather(*(self._run_probe(name, probe) for name, probe in checks.items()))
+        return dict(zip(checks, results))
+    
+    async def _run_probe(self, check_name: str, probe) -> bool:
+        """Run one blocking probe on a worker thread"""
+        try:
+            return bool(await asyncio.to_thread(probe))
+        except Exception as e:
+            logger.error(f"Health check '{check_name}' failed: {e}")
+            return False